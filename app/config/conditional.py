@@ -0,0 +1,83 @@
+"""
+Conditional GET support for read endpoints.
+"""
+
+import calendar
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalListMixin:
+    """
+    Answer ``If-None-Match`` on list requests before serializing.
+
+    Validators come from one aggregate over the ``updated_at`` column of the
+    rows the request would return, so a 304 costs a single cheap query and
+    never runs the serializer. Paginated lists only aggregate their page.
+
+    Lists only get an ``ETag``: a deleted row, or one that no longer matches
+    the filters, leaves the newest ``updated_at`` where it was, so a
+    ``Last-Modified`` taken from it would answer 304 for a changed list.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        get_window = getattr(self.paginator, "get_window", None)
+        if get_window is not None:
+            window = get_window(queryset, request)
+            if window is not None:
+                queryset = window
+        return self._get_conditional_response(
+            queryset, super().list, request, *args, use_last_modified=False, **kwargs
+        )
+
+    def get_conditional_state(self, queryset):
+        """Return the ETag parts and last modification time for a queryset."""
+        stats = queryset.aggregate(
+            last_modified=Max("updated_at"), count=Count("pk"), ids=Sum("pk")
+        )
+        parts = [
+            self.request.user.pk,
+            self.request.get_full_path(),
+            stats["count"],
+            stats["ids"],
+            stats["last_modified"],
+        ]
+        return parts, stats["last_modified"]
+
+    def _get_conditional_response(
+        self, queryset, handler, request, *args, use_last_modified=True, **kwargs
+    ):
+        parts, last_modified = self.get_conditional_state(queryset)
+        digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+        etag = f'W/"{digest}"'
+        timestamp = None
+        if use_last_modified and last_modified is not None:
+            timestamp = calendar.timegm(last_modified.utctimetuple())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Also answer ``If-None-Match``/``If-Modified-Since`` on retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self._get_conditional_response(
+            queryset, super().retrieve, request, *args, **kwargs
+        )
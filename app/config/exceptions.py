@@ -0,0 +1,30 @@
+"""
+Shared API exceptions.
+"""
+
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class Conflict(APIException):
+    """The request conflicts with the current state of the resource."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("The request conflicts with an existing resource.")
+    default_code = "conflict"
+
+
+class UnprocessableEntity(APIException):
+    """The request is well formed but cannot be processed as sent."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _("The request cannot be processed.")
+    default_code = "unprocessable_entity"
+
+
+def is_constraint_violation(error, name):
+    """Return True when an IntegrityError was raised by the named constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == name
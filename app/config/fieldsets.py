@@ -0,0 +1,105 @@
+"""
+Sparse fieldsets (``?fields=``) and expansion (``?expand=``) for the API.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_names(value):
+    """Return the names of a comma separated query parameter."""
+    return [name for name in (part.strip() for part in value.split(",")) if name]
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializer mixin limiting its output to the requested fields.
+
+    Fields listed in ``Meta.expandable_fields`` are left out unless named
+    in ``expand``; ``fields`` keeps only the named fields plus the
+    expanded ones. Unknown names are ignored.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = set(expand or ())
+        for name in set(getattr(self.Meta, "expandable_fields", ())) - expand:
+            self.fields.pop(name, None)
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - expand:
+                self.fields.pop(name)
+
+    def get_model_fields(self):
+        """
+        Return the model fields read by the remaining serializer fields, or
+        None when one of them is computed from more than its own column.
+        """
+        model = self.Meta.model
+        names = {model._meta.pk.name}
+        for field in self.fields.values():
+            if field.source == "*":
+                continue
+            name = field.source.split(".")[0]
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+            names.add(model_field.name)
+        return names
+
+
+class SparseFieldsMixin:
+    """
+    Viewset mixin passing ``?fields=`` and ``?expand=`` to the serializer on
+    read requests and deferring the columns it does not need.
+    """
+
+    def get_requested_fields(self):
+        """Return the names in ``?fields=``, or None when not given."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        value = self.request.query_params.get(FIELDS_PARAM)
+        if value is None:
+            return None
+        return parse_names(value)
+
+    def get_requested_expand(self):
+        """Return the names in ``?expand=``."""
+        if self.request.method not in SAFE_METHODS:
+            return []
+        return parse_names(self.request.query_params.get(EXPAND_PARAM, ""))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsSerializerMixin):
+            kwargs.setdefault("fields", self.get_requested_fields())
+            kwargs.setdefault("expand", self.get_requested_expand())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_requested_fields() is None:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsSerializerMixin):
+            return queryset
+        names = serializer.get_model_fields()
+        if names is None:
+            return queryset
+
+        # Keep the ordering columns loaded for the pagination cursor.
+        model = queryset.model
+        for name in queryset.query.order_by:
+            if not isinstance(name, str):
+                continue
+            try:
+                names.add(model._meta.get_field(name.lstrip("-")).name)
+            except FieldDoesNotExist:
+                continue
+        return queryset.only(*names)
@@ -0,0 +1,111 @@
+"""
+Django command to check occupancy bitmaps against the reservation rows.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from property.models import Property
+from reservation import occupancy
+from reservation.models import Occupancy, Reservation
+
+
+class Command(BaseCommand):
+    """Django command to find and optionally repair drifted occupancy bitmaps."""
+
+    help = "Compare every occupancy bitmap with the nights of its reservations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Rebuild mismatched, missing and stale bitmaps.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        origin = occupancy.get_origin()
+        batch_size = options["batch_size"]
+        checked = 0
+        mismatched, missing, stale = [], [], []
+        last_id = 0
+        while True:
+            batch = list(
+                Property.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]
+
+            rows = {
+                property_id: (row_origin, occupancy.parse_bits(bits))
+                for property_id, row_origin, bits in Occupancy.objects.filter(
+                    property_id__in=batch
+                ).values_list("property_id", "origin", "bits")
+            }
+            expected = self.get_expected(rows)
+            for property_id in batch:
+                if property_id not in rows:
+                    missing.append(property_id)
+                    continue
+                checked += 1
+                row_origin, bitmap = rows[property_id]
+                if bitmap != expected[property_id]:
+                    mismatched.append(property_id)
+                if row_origin != origin:
+                    stale.append(property_id)
+
+        self.stdout.write(
+            f"Checked {checked} bitmaps: {len(mismatched)} mismatched, "
+            f"{len(missing)} missing, {len(stale)} stale."
+        )
+        if mismatched:
+            self.stdout.write(
+                "Mismatched properties: " + ", ".join(map(str, mismatched))
+            )
+
+        if options["repair"]:
+            self.repair(mismatched, missing + stale)
+            repaired = len(set(mismatched + missing + stale))
+            self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} bitmaps."))
+        elif mismatched:
+            raise CommandError(f"{len(mismatched)} occupancy bitmaps are inconsistent.")
+
+    def get_expected(self, rows):
+        """Return the bitmap each row should hold, computed from reservations."""
+        expected = defaultdict(int)
+        if not rows:
+            return expected
+
+        origins = [row_origin for row_origin, bitmap in rows.values()]
+        stays = Reservation.objects.filter(
+            property_id__in=rows,
+            start_date__lt=max(origins) + timedelta(days=occupancy.WINDOW_DAYS),
+            end_date__gt=min(origins),
+        ).values_list("property_id", "start_date", "end_date")
+        for property_id, start_date, end_date in stays:
+            row_origin = rows[property_id][0]
+            first = max((start_date - row_origin).days, 0)
+            last = min((end_date - row_origin).days, occupancy.WINDOW_DAYS)
+            if first < last:
+                expected[property_id] |= ((1 << (last - first)) - 1) << first
+        return expected
+
+    def repair(self, mismatched, outdated):
+        """Rebuild mismatched bitmaps in place and refresh the outdated ones."""
+        if mismatched:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {occupancy.TABLE} "
+                    f"SET bits = {occupancy.TABLE}_build(property_id, origin) "
+                    f"WHERE property_id = ANY(%s::bigint[])",
+                    [mismatched],
+                )
+        if outdated:
+            occupancy.refresh(outdated)
@@ -0,0 +1,99 @@
+"""
+Django command to stream an export of properties, reservations or payments.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from config.export import ENCODERS, export
+from payment.models import Payment
+from payment.views import PaymentViewSet
+from property.filters import PropertyFilter
+from property.models import Property
+from property.views import PropertyViewSet
+from reservation.models import Reservation
+from reservation.views import ReservationViewSet
+
+
+def get_properties(user):
+    queryset = Property.objects.all()
+    if user is not None:
+        queryset = Property.objects.visible_to(user)
+    return queryset.order_by("-id")
+
+
+def get_reservations(user):
+    queryset = Reservation.objects.all()
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    return queryset.order_by("start_date")
+
+
+def get_payments(user):
+    queryset = Payment.objects.all()
+    if user is not None:
+        queryset = queryset.filter(reservation__user=user)
+    return queryset.order_by("-id")
+
+
+RESOURCES = {
+    "properties": (get_properties, PropertyViewSet.export_fields),
+    "reservations": (get_reservations, ReservationViewSet.export_fields),
+    "payments": (get_payments, PaymentViewSet.export_fields),
+}
+
+
+class Command(BaseCommand):
+    """Django command to export a table as CSV or NDJSON with flat memory use."""
+
+    help = "Stream properties, reservations or payments as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=sorted(RESOURCES))
+        parser.add_argument("--format", choices=sorted(ENCODERS), default="ndjson")
+        parser.add_argument("--output", help="File to write to, stdout by default.")
+        parser.add_argument("--user", help="Scope rows to the user with this email.")
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Property filter, as accepted by the property list endpoint.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        user = None
+        if options["user"]:
+            user = get_user_model().objects.filter(email=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No user with email {options['user']}.")
+
+        get_queryset, fields = RESOURCES[options["resource"]]
+        queryset = get_queryset(user)
+        if options["filter"]:
+            if options["resource"] != "properties":
+                raise CommandError("--filter is only supported for properties.")
+            queryset = self.filter_properties(queryset, options["filter"])
+
+        chunks = export(queryset, fields, options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+
+    def filter_properties(self, queryset, filters):
+        data = {}
+        for item in filters:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"Invalid filter {item!r}, expected NAME=VALUE.")
+            data[name] = value
+
+        filterset = PropertyFilter(data=data, queryset=queryset)
+        if not filterset.is_valid():
+            raise CommandError(f"Invalid filters: {filterset.errors.as_json()}")
+        return filterset.qs
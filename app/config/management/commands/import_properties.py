@@ -0,0 +1,196 @@
+"""
+Django command to bulk import properties from CSV or NDJSON.
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from property.cache import invalidate
+from property.models import Property
+from property.serializers import PropertyImportSerializer
+
+STAGING_TABLE = "property_import_staging"
+IMPORTED_FIELDS = ["id", "name", "location", "price", "description", "owner"]
+
+
+def read_csv(file):
+    """Yield ``(line, row)`` pairs, leaving empty cells out of the row."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, {k: v for k, v in row.items() if v not in ("", None)}
+
+
+def read_ndjson(file):
+    """Yield ``(line, row)`` pairs, one JSON object per line."""
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as error:
+            row = error
+        yield line, row
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+class Command(BaseCommand):
+    """
+    Django command to load properties through COPY and a single upsert.
+
+    Rows are validated in Python with the serializer rules, copied into a
+    temporary staging table and merged into the property table in batches.
+    Rows with an ``id`` update that property; rows without one are inserted.
+    """
+
+    help = "Import properties from a CSV or NDJSON file ('-' reads stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(READERS))
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        format = options["format"]
+        if format is None:
+            format = "ndjson" if options["path"].endswith(".ndjson") else "csv"
+
+        self.start = time.monotonic()
+        self.stats = {"inserted": 0, "updated": 0, "rejected": 0}
+        if options["path"] == "-":
+            self.import_rows(READERS[format](sys.stdin), options["batch_size"])
+        else:
+            try:
+                file = open(options["path"], encoding="utf-8", newline="")
+            except OSError as error:
+                raise CommandError(error)
+            with file:
+                self.import_rows(READERS[format](file), options["batch_size"])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+
+        elapsed = time.monotonic() - self.start
+        imported = self.stats["inserted"] + self.stats["updated"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} properties ({self.stats['inserted']} inserted, "
+                f"{self.stats['updated']} updated), rejected {self.stats['rejected']} "
+                f"rows in {elapsed:.2f}s ({imported / max(elapsed, 1e-6):.0f} rows/s)."
+            )
+        )
+
+    def import_rows(self, rows, batch_size):
+        validator = PropertyImportSerializer()
+        batch = {}
+        for line, row in rows:
+            try:
+                if not isinstance(row, dict):
+                    raise ValidationError({"non_field_errors": [str(row)]})
+                data = validator.run_validation(row)
+            except ValidationError as error:
+                self.reject(line, error.detail)
+                continue
+
+            # A later row for the same id replaces the earlier one.
+            batch[data.get("id") or -line] = (line, data)
+            if len(batch) >= batch_size:
+                self.load(batch.values())
+                batch = {}
+        if batch:
+            self.load(batch.values())
+
+    def reject(self, line, errors):
+        self.stats["rejected"] += 1
+        self.stderr.write(f"line {line}: {json.dumps(errors)}")
+
+    def load(self, batch):
+        """COPY one batch into the staging table and upsert it."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for line, data in batch:
+            writer.writerow(
+                [line, data.get("id"), data["name"], data["location"], data["price"]]
+                + [data.get("description", ""), data.get("owner")]
+            )
+        buffer.seek(0)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} ("
+                "line integer, id bigint, name varchar(255), location varchar(255), "
+                "price numeric(10, 2), description text, owner_id bigint"
+                ") ON COMMIT DELETE ROWS"
+            )
+            cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} FROM STDIN "
+                "WITH (FORMAT csv, FORCE_NULL (id, owner_id))",
+                buffer,
+            )
+            self.reject_unknown_owners(cursor)
+            rows = self.upsert(cursor)
+
+        for property_id, inserted in rows:
+            if inserted:
+                self.stats["inserted"] += 1
+            else:
+                self.stats["updated"] += 1
+                invalidate(property_id, include_global=False)
+        invalidate()
+
+    def reject_unknown_owners(self, cursor):
+        users = get_user_model()._meta.db_table
+        cursor.execute(
+            f"DELETE FROM {STAGING_TABLE} s WHERE s.owner_id IS NOT NULL "
+            f'AND NOT EXISTS (SELECT 1 FROM "{users}" u WHERE u.id = s.owner_id) '
+            "RETURNING s.line, s.owner_id"
+        )
+        for line, owner_id in sorted(cursor.fetchall()):
+            message = f'Invalid pk "{owner_id}" - object does not exist.'
+            self.reject(line, {"owner": [message]})
+
+    def upsert(self, cursor):
+        """Merge the staging rows and return ``(id, inserted)`` pairs."""
+        meta = Property._meta
+        table = meta.db_table
+        imported = {meta.get_field(name).column for name in IMPORTED_FIELDS}
+        defaults = {
+            field.column: field.get_db_prep_save(field.get_default(), connection)
+            for field in meta.concrete_fields
+            if field.column not in imported and field.has_default()
+        }
+        defaults["updated_at"] = timezone.now()
+        columns = sorted(imported - {"id"})
+        sequence = f"pg_get_serial_sequence('\"{table}\"', 'id')"
+
+        # Move the sequence past explicit ids so new rows never collide.
+        cursor.execute(
+            f"SELECT setval({sequence}, max_id) FROM ("
+            f'SELECT GREATEST((SELECT MAX(id) FROM "{table}"), '
+            f"(SELECT MAX(id) FROM {STAGING_TABLE})) AS max_id) t "
+            f"WHERE max_id >= (SELECT nextval({sequence}))"
+        )
+        cursor.execute(
+            f'INSERT INTO "{table}" (id, {", ".join(columns + list(defaults))}) '
+            f"SELECT COALESCE(s.id, nextval({sequence})), "
+            f"{', '.join([f's.{c}' for c in columns] + ['%s'] * len(defaults))} "
+            f"FROM {STAGING_TABLE} s ORDER BY s.line "
+            f"ON CONFLICT (id) DO UPDATE SET "
+            f"{', '.join(f'{c} = EXCLUDED.{c}' for c in columns + ['updated_at'])} "
+            "RETURNING id, xmax = 0",
+            list(defaults.values()),
+        )
+        return cursor.fetchall()
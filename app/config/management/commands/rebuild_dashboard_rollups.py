@@ -0,0 +1,23 @@
+"""
+Django command to rebuild the owner dashboard rollup.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from dashboard import rollup
+
+
+class Command(BaseCommand):
+    """Django command to recompute the daily rollup and repair drift."""
+
+    help = "Recompute nights, revenue and reviews per property and day."
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in rollup.get_rebuild_sql():
+                cursor.execute(statement)
+            rebuilt = cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} property days."))
@@ -0,0 +1,60 @@
+"""
+Django command to rebuild property rating aggregates from reviews.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from property.models import RATING_STARS, Property
+from review.models import Review
+
+
+class Command(BaseCommand):
+    """Django command to recompute rating aggregates and repair drift."""
+
+    help = "Recompute rating average, count and histogram for every property."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        stats = Review.objects.values("property").annotate(
+            count=Count("id"),
+            total=Sum("rating"),
+            **{
+                f"rating_{star}_count": Count("id", filter=Q(rating=star))
+                for star in RATING_STARS
+            },
+        )
+        fields = ["rating_avg", "rating_count", "rating_sum"] + [
+            f"rating_{star}_count" for star in RATING_STARS
+        ]
+
+        batch_size = options["batch_size"]
+        rebuilt = 0
+        with transaction.atomic():
+            Property.objects.update(**{field: 0 for field in fields})
+            properties = []
+            for row in stats.order_by("property").iterator(chunk_size=batch_size):
+                property = Property(
+                    pk=row["property"],
+                    rating_count=row["count"],
+                    rating_sum=row["total"],
+                    rating_avg=round(row["total"] / row["count"], 2),
+                )
+                for star in RATING_STARS:
+                    field = f"rating_{star}_count"
+                    setattr(property, field, row[field])
+                properties.append(property)
+                if len(properties) >= batch_size:
+                    Property.objects.bulk_update(properties, fields)
+                    rebuilt += len(properties)
+                    properties = []
+            Property.objects.bulk_update(properties, fields)
+            rebuilt += len(properties)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt ratings for {rebuilt} properties.")
+        )
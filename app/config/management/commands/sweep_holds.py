@@ -0,0 +1,44 @@
+"""
+Django command to delete expired reservation holds.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from reservation.holds import sweep_expired
+
+
+class Command(BaseCommand):
+    """Django command to delete expired holds in batches."""
+
+    help = "Delete reservation holds past their expiry."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and sweep every INTERVAL seconds.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if not options["interval"]:
+            self.sweep(options["batch_size"])
+            return
+
+        while True:
+            close_old_connections()
+            try:
+                self.sweep(options["batch_size"])
+            except DatabaseError as error:
+                # The next round retries; a sweep is never urgent.
+                self.stderr.write(f"Sweep failed: {error}")
+            time.sleep(options["interval"])
+
+    def sweep(self, batch_size):
+        deleted = sweep_expired(batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} holds."))
@@ -0,0 +1,30 @@
+"""
+Django command to delete expired idempotency keys.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from idempotency.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """Django command to delete expired idempotency keys in batches."""
+
+    help = "Delete idempotency keys whose replay window has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+        batch_size = options["batch_size"]
+        deleted = 0
+        while True:
+            batch = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} idempotency keys."))
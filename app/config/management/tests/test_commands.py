@@ -2,13 +2,29 @@
 Test custom Django management commands.
 """
 
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from dashboard.models import PropertyDay
+from idempotency.models import IdempotencyKey
+from payment.models import Payment
+from property.models import Property
+from reservation import occupancy
+from reservation.models import Hold, Occupancy, Reservation
+from review.models import Review
 
 
 @patch("config.management.commands.wait_for_db.Command.check")
@@ -34,3 +50,330 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class RebuildPropertyRatingsTests(TestCase):
+    """Test rebuilding property rating aggregates."""
+
+    def test_rebuild_repairs_drift(self):
+        """Test aggregates are recomputed from the review rows."""
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        rated = Property.objects.create(
+            name="Rated", price=Decimal("3.5"), rating_count=9, rating_avg=1
+        )
+        drifted = Property.objects.create(
+            name="Drifted", price=Decimal("3.5"), rating_count=3, rating_sum=12
+        )
+        for rating in (5, 4, 4):
+            Review.objects.create(property=rated, user=user, rating=rating)
+
+        call_command("rebuild_property_ratings", stdout=StringIO())
+
+        rated.refresh_from_db()
+        drifted.refresh_from_db()
+        self.assertEqual(rated.rating_count, 3)
+        self.assertEqual(rated.rating_sum, 13)
+        self.assertEqual(rated.rating_avg, Decimal("4.33"))
+        self.assertEqual(rated.rating_histogram, {1: 0, 2: 0, 3: 0, 4: 2, 5: 1})
+        self.assertEqual(drifted.rating_count, 0)
+        self.assertEqual(drifted.rating_sum, 0)
+
+
+class RebuildDashboardRollupsTests(TestCase):
+    """Test rebuilding the owner dashboard rollup."""
+
+    def test_rebuild_repairs_drift(self):
+        """Test the rollup is recomputed from reservations, payments and reviews."""
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        property = Property.objects.create(name="Booked", price=Decimal("3.5"))
+        reservation = Reservation.objects.create(
+            property=property,
+            user=user,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 3),
+        )
+        payment = Payment.objects.create(
+            reservation=reservation, amount=Decimal("70.00"), payment_method="card"
+        )
+        Review.objects.create(property=property, user=user, rating=5)
+        expected = list(
+            PropertyDay.objects.order_by("day").values_list(
+                "day", "nights", "revenue", "reviews"
+            )
+        )
+        PropertyDay.objects.update(nights=9, revenue=0)
+        PropertyDay.objects.create(property=property, day=date(2023, 1, 1), nights=1)
+
+        out = StringIO()
+        call_command("rebuild_dashboard_rollups", stdout=out)
+
+        rebuilt = list(
+            PropertyDay.objects.order_by("day").values_list(
+                "day", "nights", "revenue", "reviews"
+            )
+        )
+        self.assertEqual(rebuilt, expected)
+        self.assertIn((date(2024, 1, 2), 1, Decimal("0.00"), 0), rebuilt)
+        self.assertIn(
+            (timezone.localdate(payment.created_at), 0, Decimal("70.00"), 1), rebuilt
+        )
+        self.assertIn(f"Rebuilt {len(expected)} property days.", out.getvalue())
+
+
+class CheckOccupancyTests(TestCase):
+    """Test checking occupancy bitmaps against reservations."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        self.property = Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        self.origin = occupancy.get_origin()
+        Reservation.objects.create(
+            property=self.property,
+            user=user,
+            start_date=self.origin + timedelta(days=1),
+            end_date=self.origin + timedelta(days=3),
+        )
+
+    def test_consistent_bitmaps(self):
+        """Test bitmaps kept by the triggers pass the check."""
+        out = StringIO()
+
+        call_command("check_occupancy", stdout=out)
+
+        self.assertIn(
+            "Checked 1 bitmaps: 0 mismatched, 0 missing, 0 stale.", out.getvalue()
+        )
+
+    def test_drift_reported_and_repaired(self):
+        """Test drifted, missing and stale bitmaps are reported and repaired."""
+        Occupancy.objects.filter(property=self.property).update(
+            bits=occupancy.format_bits(1)
+        )
+        stale = Property.objects.create(name="Stale", price=Decimal("3.5"))
+        Occupancy.objects.filter(property=stale).update(
+            origin=self.origin - timedelta(days=31)
+        )
+        missing = Property.objects.create(name="Missing", price=Decimal("3.5"))
+        Occupancy.objects.filter(property=missing).delete()
+
+        with self.assertRaises(CommandError):
+            call_command("check_occupancy", stdout=StringIO())
+
+        out = StringIO()
+        call_command("check_occupancy", "--repair", stdout=out)
+
+        self.assertIn(
+            "Checked 2 bitmaps: 1 mismatched, 1 missing, 1 stale.", out.getvalue()
+        )
+        self.assertIn("Repaired 3 bitmaps.", out.getvalue())
+        row = Occupancy.objects.get(property=self.property)
+        self.assertEqual(occupancy.parse_bits(row.bits), 0b110)
+        self.assertEqual(Occupancy.objects.filter(origin=self.origin).count(), 3)
+        out = StringIO()
+        call_command("check_occupancy", stdout=out)
+        self.assertIn(
+            "Checked 3 bitmaps: 0 mismatched, 0 missing, 0 stale.", out.getvalue()
+        )
+
+
+class SweepIdempotencyKeysTests(TestCase):
+    """Test sweeping expired idempotency keys."""
+
+    def test_sweep_deletes_expired_keys(self):
+        """Test only keys past their window are deleted."""
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        now = timezone.now()
+        for index in range(5):
+            IdempotencyKey.objects.create(
+                user=user, key=f"old-{index}", request_hash="x", expires_at=now
+            )
+        live = IdempotencyKey.objects.create(
+            user=user,
+            key="live",
+            request_hash="x",
+            expires_at=now + timedelta(hours=1),
+        )
+        out = StringIO()
+
+        call_command("sweep_idempotency_keys", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(list(IdempotencyKey.objects.all()), [live])
+        self.assertIn("Deleted 5", out.getvalue())
+
+
+class SweepHoldsTests(TestCase):
+    """Test sweeping expired reservation holds."""
+
+    def test_sweep_deletes_expired_holds(self):
+        """Test only holds past their expiry are deleted."""
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        property = Property.objects.create(
+            name="Hotel", location="Warsaw", price=Decimal("1.5"), description=""
+        )
+        now = timezone.now()
+        today = date.today()
+        for index in range(5):
+            Hold.objects.create(
+                user=user,
+                property=property,
+                start_date=today + timedelta(days=index),
+                end_date=today + timedelta(days=index + 1),
+                expires_at=now,
+            )
+        live = Hold.objects.create(
+            user=user,
+            property=property,
+            start_date=today + timedelta(days=10),
+            end_date=today + timedelta(days=11),
+            expires_at=now + timedelta(minutes=5),
+        )
+        out = StringIO()
+
+        call_command("sweep_holds", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(list(Hold.objects.all()), [live])
+        self.assertIn("Deleted 5", out.getvalue())
+
+    @patch("config.management.commands.sweep_holds.close_old_connections")
+    @patch("config.management.commands.sweep_holds.sweep_expired")
+    @patch("time.sleep")
+    def test_sweep_interval_survives_errors(
+        self, patched_sleep, patched_sweep, patched_close
+    ):
+        """Test the long-running sweep retries after a database error."""
+        patched_sweep.side_effect = [OperationalError("gone"), 3]
+        patched_sleep.side_effect = [None, KeyboardInterrupt]
+        out = StringIO()
+        err = StringIO()
+
+        with self.assertRaises(KeyboardInterrupt):
+            call_command("sweep_holds", "--interval", "30", stdout=out, stderr=err)
+
+        self.assertEqual(patched_sweep.call_count, 2)
+        patched_sleep.assert_called_with(30)
+        self.assertIn("gone", err.getvalue())
+        self.assertIn("Deleted 3", out.getvalue())
+
+
+class ExportDataTests(TestCase):
+    """Test streaming exports from the command line."""
+
+    def test_export_properties_with_filters(self):
+        """Test properties are exported through the property filters."""
+        Property.objects.create(name="Cheap", price=Decimal("1"))
+        expensive = Property.objects.create(name="Expensive", price=Decimal("9"))
+        out = StringIO()
+
+        call_command("export_data", "properties", "--filter", "price_min=5", stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [expensive.id])
+
+    def test_export_reservations_csv_to_file(self):
+        """Test exporting as CSV into a file, in small chunks."""
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reservations.csv")
+            call_command(
+                "export_data",
+                "reservations",
+                "--format",
+                "csv",
+                "--output",
+                path,
+                "--chunk-size",
+                "1",
+                stdout=out,
+            )
+            with open(path) as file:
+                content = file.read()
+
+        self.assertEqual(content.splitlines(), ["id,property,user,start_date,end_date"])
+
+
+class ImportPropertiesTests(TestCase):
+    """Test bulk importing properties."""
+
+    def import_file(self, name, content, *args):
+        out, err = StringIO(), StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, "w") as file:
+                file.write(content)
+            call_command("import_properties", path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv_rejects_invalid_rows(self):
+        """Test valid rows are loaded and invalid ones reported."""
+        owner = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        content = (
+            "name,location,price,description,owner\n"
+            f"Hotel,Warsaw,120.50,,{owner.id}\n"
+            "Free,Gdansk,0,Too cheap,\n"
+            'Villa,Krakow,300,"Pool, garden",\n'
+            "Ghost,Lodz,10,,99999\n"
+        )
+
+        out, err = self.import_file("properties.csv", content, "--batch-size", "2")
+
+        hotel = Property.objects.get(name="Hotel")
+        self.assertEqual(hotel.owner, owner)
+        self.assertEqual(hotel.price, Decimal("120.50"))
+        self.assertEqual(hotel.description, "")
+        villa = Property.objects.get(name="Villa")
+        self.assertIsNone(villa.owner)
+        self.assertEqual(villa.description, "Pool, garden")
+        self.assertEqual(Property.objects.count(), 2)
+        self.assertIn("line 3: ", err)
+        self.assertIn("Price must be greater than zero.", err)
+        self.assertIn("line 5: ", err)
+        self.assertIn("2 inserted, 0 updated), rejected 2 rows", out)
+
+    def test_import_ndjson_upserts_by_id(self):
+        """Test rows with an id update that property and new rows get fresh ids."""
+        existing = Property.objects.create(name="Old", price=Decimal("3.5"))
+        rows = [
+            {"id": existing.id, "name": "New", "location": "Warsaw", "price": "9"},
+            {"id": existing.id + 100, "name": "Explicit", "location": "", "price": 1},
+            {"id": existing.id + 200, "name": "Ahead", "location": "Lodz", "price": 1},
+            {"name": "Generated", "location": "Lodz", "price": "2.5"},
+        ]
+        content = "".join(json.dumps(row) + "\n" for row in rows)
+
+        out, err = self.import_file("properties.ndjson", content)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.name, "New")
+        self.assertEqual(existing.price, Decimal("9"))
+        self.assertIn("2 inserted, 1 updated", out)
+        self.assertIn("location", err)
+        self.assertFalse(Property.objects.filter(name="Explicit").exists())
+        self.assertTrue(Property.objects.filter(name="Generated").exists())
+        created = Property.objects.create(name="After", price=Decimal("1"))
+        self.assertGreater(created.id, existing.id + 200)
+
+
+class BenchmarkListSerializationTests(TestCase):
+    """Test the list serialization benchmark."""
+
+    def test_benchmark_reports_both_paths(self):
+        """Test the benchmark compares both paths on existing rows."""
+        Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        out = StringIO()
+
+        call_command("benchmark_list_serialization", "--repeat", "1", stdout=out)
+
+        self.assertIn("properties: 1 rows, serializer", out.getvalue())
+        self.assertIn("reservations: no rows to benchmark.", out.getvalue())
@@ -0,0 +1,240 @@
+"""
+Keyset (cursor) pagination shared by the API views.
+"""
+
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.encoding import force_str
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination keyed on the queryset ordering plus the pk.
+
+    The cursor stores the ordering values of the boundary row, so every page
+    is a bounded index range scan and no COUNT(*) is ever issued. Pagination
+    is opt-in: it is only applied when the client sends ``page_size`` or
+    ``cursor``, otherwise the full list is returned as before.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request)
+        if window is None:
+            return None
+
+        cursor = self.cursor
+        reverse = cursor is not None and cursor["reverse"]
+        rows = list(window)
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None and (has_more or not reverse)
+        return self.page
+
+    def get_window(self, queryset, request):
+        """
+        Return the rows of the requested page plus one as a sliced queryset,
+        or None when the client did not opt in.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if self.page_size is None:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.keys = self.get_ordering(queryset)
+        self.cursor = cursor = self.decode_cursor(request, queryset)
+
+        ordering = self.keys
+        if cursor is not None and cursor["reverse"]:
+            ordering = [self._invert(key) for key in ordering]
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, cursor["position"])
+            )
+        return queryset[: self.page_size + 1]
+
+    def get_page_size(self, request):
+        """Return the page size, or None when the client did not opt in."""
+        params = request.query_params
+        if self.page_size_query_param not in params:
+            return self.page_size if self.cursor_query_param in params else None
+
+        try:
+            value = int(params[self.page_size_query_param])
+        except (TypeError, ValueError):
+            return self.page_size
+        if value <= 0:
+            return self.page_size
+        return min(value, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return the effective ordering with the pk appended as tie-breaker."""
+        ordering = [force_str(key) for key in queryset.query.order_by or self.ordering]
+        pk_name = queryset.model._meta.pk.name
+        names = [key.lstrip("-") for key in ordering]
+        if "pk" not in names and pk_name not in names:
+            descending = ordering[0].startswith("-")
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    def get_keyset_filter(self, ordering, position):
+        """Build the "after this row" predicate for the given ordering."""
+        condition = Q()
+        equal = Q()
+        for key, value in zip(ordering, position):
+            name = key.lstrip("-")
+            lookup = "lt" if key.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & condition
+
+    def get_position(self, instance):
+        """Return the ordering values of a row, as JSON-friendly values."""
+        position = []
+        for key in self.keys:
+            name = key.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            if not isinstance(value, (int, str)):
+                value = str(value)
+            position.append(value)
+        return position
+
+    def get_key_field(self, queryset, name):
+        """Return the model field or annotation output field behind a key."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        opts = queryset.model._meta
+        field = None
+        for part in name.split("__"):
+            field = opts.pk if part == "pk" else opts.get_field(part)
+            if field.is_relation:
+                opts = field.related_model._meta
+        return field
+
+    def decode_cursor(self, request, queryset):
+        """Return the decoded cursor, or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            cursor = {"position": list(data["p"]), "reverse": bool(data["r"])}
+            if len(cursor["position"]) != len(self.keys):
+                raise ValueError("Cursor does not match the ordering.")
+            # A cursor carried over from another ordering must not reach the
+            # database comparison with values of the wrong type.
+            cursor["position"] = [
+                self.get_key_field(queryset, key.lstrip("-")).to_python(value)
+                for key, value in zip(self.keys, cursor["position"])
+            ]
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            binascii.Error,
+            FieldDoesNotExist,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, position, reverse):
+        """Return the URL for a cursor at the given position."""
+        data = json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":"))
+        encoded = urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def build_next_link(self, url, instance, ordering):
+        """Return a link to the page after ``instance`` in a collection at url."""
+        self.base_url = replace_query_param(
+            url, self.page_size_query_param, self.page_size
+        )
+        self.keys = list(ordering)
+        return self.encode_cursor(self.get_position(instance), reverse=False)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def _invert(key):
+        return key[1:] if key.startswith("-") else f"-{key}"
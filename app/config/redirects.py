@@ -0,0 +1,27 @@
+"""
+Redirects for retired API paths.
+"""
+
+from django.http import HttpResponsePermanentRedirect
+from django.views.decorators.csrf import csrf_exempt
+
+
+class HttpResponsePermanentRedirectKeepMethod(HttpResponsePermanentRedirect):
+    """Permanent redirect that clients must follow with the same method."""
+
+    status_code = 308
+
+
+@csrf_exempt
+def legacy_reservation_redirect(request, path):
+    """
+    Redirect ``/api/reservation<route>`` to ``/api/reservation/<route>``.
+
+    The reservation routes used to be included without a slash after the
+    prefix, e.g. ``/api/reservationreservations/``.
+    """
+    url = f"/api/reservation/{path}"
+    query = request.META.get("QUERY_STRING")
+    if query:
+        url = f"{url}?{query}"
+    return HttpResponsePermanentRedirectKeepMethod(url)
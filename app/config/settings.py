@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,12 +39,15 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django",
     "config",
     "user",
     "reservation",
     "review",
     "payment",
+    "idempotency",
+    "dashboard",
     "property",
     "rest_framework.authtoken",
     "django_filters",
@@ -85,6 +89,11 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Minimum pg_trgm word similarity for fuzzy property name/location search.
+PROPERTY_SEARCH_SIMILARITY_THRESHOLD = float(
+    os.environ.get("PROPERTY_SEARCH_SIMILARITY_THRESHOLD", 0.5)
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -92,10 +101,63 @@ DATABASES = {
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        "OPTIONS": {
+            "options": (
+                "-c pg_trgm.word_similarity_threshold="
+                f"{PROPERTY_SEARCH_SIMILARITY_THRESHOLD}"
+            ),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_DIR", "/tmp/stayreserve-cache"),
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            # Culling lists the whole directory, so keep it rare: the default
+            # of 300 entries is reached by a handful of busy list pages.
+            "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 100000)),
+            "CULL_FREQUENCY": 10,
+        },
+    }
+}
+
+TEST_RUNNER = "config.test_runner.TestRunner"
+
+PROPERTY_CACHE_TIMEOUT = 300
+# Count property cache hits and misses; off by default since every count
+# is an extra, non-atomic cache write per request.
+PROPERTY_CACHE_STATS = bool(int(os.environ.get("PROPERTY_CACHE_STATS", 0)))
+
+AUTH_TOKEN_CACHE_SIZE = 1024
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+AUTH_TOKEN_CACHE_LOCAL_TIMEOUT = 30
+
+OCCUPANCY_CACHE_SIZE = 10000
+OCCUPANCY_CACHE_TIMEOUT = 300
+
+SIGNED_TOKEN_ACCESS_LIFETIME = 15 * 60
+SIGNED_TOKEN_REFRESH_LIFETIME = 7 * 24 * 60 * 60
+
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+RESERVATION_BULK_MAX_SIZE = 500
+
+RESERVATION_HOLD_TTL = 10 * 60
+
+EXPORT_CHUNK_SIZE = 2000
+
+DASHBOARD_MAX_DAYS = 366
+
+AVAILABILITY_BATCH_MAX_SIZE = 200
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -144,4 +206,22 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
+
+# MessagePack is only negotiated when the optional msgpack package is installed.
+if find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "config.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append(
+        "config.renderers.MessagePackParser"
+    )
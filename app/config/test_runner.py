@@ -0,0 +1,34 @@
+"""
+Test runner for the project.
+"""
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Run the tests against a process-local cache.
+
+    The configured file cache is shared with the development server and
+    outlives the test database, whose ids repeat between runs, so cached
+    tokens and users of an earlier run could authenticate in this one.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "stayreserve-test",
+                    "TIMEOUT": 300,
+                    "OPTIONS": {"MAX_ENTRIES": 100000},
+                }
+            }
+        )
+        self._cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_settings.disable()
+        super().teardown_test_environment(**kwargs)
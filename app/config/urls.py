@@ -23,7 +23,9 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from config.redirects import legacy_reservation_redirect
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -35,5 +37,7 @@ urlpatterns = [
     ),
     path("api/user/", include("user.urls")),
     path("api/property/", include("property.urls")),
-    path("api/reservation", include("reservation.urls")),
+    path("api/reservation/", include("reservation.urls")),
+    re_path(r"^api/reservation(?P<path>[^/].*)$", legacy_reservation_redirect),
+    path("api/dashboard/", include("dashboard.urls")),
 ]
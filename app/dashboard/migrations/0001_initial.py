@@ -0,0 +1,61 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:56
+
+import dashboard.rollup
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0006_reservation_updated_at"),
+        ("payment", "0003_payment_unique_reservation"),
+        ("review", "0003_review_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertyDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("nights", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("reviews", models.IntegerField(default=0)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="days",
+                        to="property.property",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="propertyday",
+            constraint=models.UniqueConstraint(
+                fields=("property", "day"), name="dashboard_property_day_unique"
+            ),
+        ),
+        migrations.RunSQL(
+            dashboard.rollup.get_create_sql(), dashboard.rollup.get_drop_sql()
+        ),
+        migrations.RunSQL(dashboard.rollup.get_rebuild_sql(), migrations.RunSQL.noop),
+    ]
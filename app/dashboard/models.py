@@ -0,0 +1,39 @@
+"""
+Dashboard models.
+"""
+
+from django.db import models
+
+from property.models import Property
+
+DAY_CONSTRAINT = "dashboard_property_day_unique"
+
+
+class PropertyDay(models.Model):
+    """
+    Daily rollup of nights booked, revenue and reviews for one property.
+
+    Rows are maintained by database triggers (see ``dashboard.rollup``), so
+    every write path, including bulk inserts and cascades, keeps them in
+    step. Rows are removed by a trigger when their property is deleted.
+    """
+
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.DO_NOTHING,
+        related_name="days",
+        db_constraint=False,
+        db_index=False,
+    )
+    day = models.DateField()
+    nights = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    reviews = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["property", "day"], name=DAY_CONSTRAINT),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} on {self.day}"
@@ -0,0 +1,140 @@
+"""
+SQL maintaining the ``PropertyDay`` rollup.
+
+Statement-level triggers on reservations, payments and reviews turn the
+changed rows into ``(property, day)`` deltas and upsert them in one
+statement, so bulk inserts pay one extra statement rather than one per row
+and no write path can skip the rollup. A stay adds a night for every day in
+``[start_date, end_date)``; payments and reviews count on the UTC day they
+were recorded.
+"""
+
+TABLE = "dashboard_propertyday"
+
+# Delta rows ``(property_id, day, nights, revenue, reviews)`` for each source,
+# formatted with the transition table (``rows``) and ``sign``.
+DELTAS = {
+    "reservation_reservation": (
+        "SELECT property_id, "
+        "generate_series(start_date::timestamp, (end_date - 1)::timestamp, "
+        "interval '1 day')::date AS day, "
+        "{sign} AS nights, 0::numeric AS revenue, 0 AS reviews FROM {rows}"
+    ),
+    "payment_payment": (
+        "SELECT r.property_id, (p.created_at AT TIME ZONE 'UTC')::date AS day, "
+        "0 AS nights, {sign} * p.amount AS revenue, 0 AS reviews "
+        "FROM {rows} p JOIN reservation_reservation r ON r.id = p.reservation_id"
+    ),
+    "review_review": (
+        "SELECT property_id, (created_at AT TIME ZONE 'UTC')::date AS day, "
+        "0 AS nights, 0::numeric AS revenue, {sign} AS reviews FROM {rows}"
+    ),
+}
+
+UPSERT = f"""
+INSERT INTO {TABLE} (property_id, day, nights, revenue, reviews)
+SELECT property_id, day, SUM(nights), SUM(revenue), SUM(reviews)
+FROM ({{deltas}}) AS deltas
+GROUP BY property_id, day
+ORDER BY property_id, day
+ON CONFLICT (property_id, day) DO UPDATE SET
+    nights = {TABLE}.nights + EXCLUDED.nights,
+    revenue = {TABLE}.revenue + EXCLUDED.revenue,
+    reviews = {TABLE}.reviews + EXCLUDED.reviews
+"""
+
+EVENTS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_rows",
+    "UPDATE": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def get_function_name(source):
+    """Return the name of the trigger function for a source table."""
+    return f"{TABLE}_{source}_rollup"
+
+
+def get_function_sql(source):
+    """Return the trigger function applying a source table's changes."""
+    delta = DELTAS[source]
+    added = delta.format(rows="new_rows", sign="1")
+    removed = delta.format(rows="old_rows", sign="-1")
+    return f"""
+CREATE OR REPLACE FUNCTION {get_function_name(source)}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {UPSERT.format(deltas=added)};
+    ELSIF TG_OP = 'DELETE' THEN
+        {UPSERT.format(deltas=removed)};
+    ELSE
+        {UPSERT.format(deltas=f"{added} UNION ALL {removed}")};
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+
+def get_create_sql():
+    """Return the statements installing every rollup trigger."""
+    statements = []
+    for source in DELTAS:
+        statements.append(get_function_sql(source))
+        for event, referencing in EVENTS.items():
+            statements.append(
+                f"CREATE TRIGGER {get_function_name(source)}_{event.lower()} "
+                f"AFTER {event} ON {source} {referencing} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {get_function_name(source)}()"
+            )
+
+    # Deleting a property first deletes its reservations and reviews, whose
+    # triggers write negative deltas; drop its rows once the property goes.
+    statements.append(
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_property_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM {TABLE} d USING old_rows o WHERE d.property_id = o.id;
+    RETURN NULL;
+END
+$$;
+"""
+    )
+    statements.append(
+        f"CREATE TRIGGER {TABLE}_property_delete AFTER DELETE ON property_property "
+        f"REFERENCING OLD TABLE AS old_rows "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {TABLE}_property_delete()"
+    )
+    return statements
+
+
+def get_drop_sql():
+    """Return the statements removing every rollup trigger."""
+    statements = []
+    for source in DELTAS:
+        for event in EVENTS:
+            statements.append(
+                f"DROP TRIGGER IF EXISTS {get_function_name(source)}_{event.lower()} "
+                f"ON {source}"
+            )
+        statements.append(f"DROP FUNCTION IF EXISTS {get_function_name(source)}()")
+    statements.append(
+        f"DROP TRIGGER IF EXISTS {TABLE}_property_delete ON property_property"
+    )
+    statements.append(f"DROP FUNCTION IF EXISTS {TABLE}_property_delete()")
+    return statements
+
+
+def get_rebuild_sql():
+    """Return the statements recomputing the whole rollup from source rows."""
+    deltas = " UNION ALL ".join(
+        delta.format(rows=source, sign="1") for source, delta in DELTAS.items()
+    )
+    # Block trigger writes so none land between the delete and the insert.
+    return [
+        f"LOCK TABLE {TABLE} IN EXCLUSIVE MODE",
+        f"DELETE FROM {TABLE}",
+        UPSERT.format(deltas=deltas),
+    ]
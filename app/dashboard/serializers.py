@@ -0,0 +1,51 @@
+"""
+Serializers for the dashboard API.
+"""
+
+from django.conf import settings
+
+from rest_framework import serializers
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    """Serializer for the ``[start_date, end_date)`` range of a dashboard."""
+
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, attrs):
+        """Validate that the range is not empty and not too long."""
+        days = (attrs["end_date"] - attrs["start_date"]).days
+        if days <= 0:
+            raise serializers.ValidationError("End date must be after start date.")
+        if days > settings.DASHBOARD_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range must not exceed {settings.DASHBOARD_MAX_DAYS} days."
+            )
+        return attrs
+
+
+class DashboardTotalsSerializer(serializers.Serializer):
+    """Serializer for rollup totals over a date range."""
+
+    nights = serializers.IntegerField()
+    occupancy = serializers.FloatField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    reviews = serializers.IntegerField()
+
+
+class DashboardPropertySerializer(DashboardTotalsSerializer):
+    """Serializer for the rollup totals of one property."""
+
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class DashboardSerializer(serializers.Serializer):
+    """Serializer for an owner dashboard."""
+
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    days = serializers.IntegerField()
+    totals = DashboardTotalsSerializer()
+    properties = DashboardPropertySerializer(many=True)
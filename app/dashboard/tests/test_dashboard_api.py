@@ -0,0 +1,255 @@
+"""
+Tests for the dashboard API.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from dashboard.models import PropertyDay
+from property.models import Property
+from reservation.models import Reservation
+from review.models import Review
+
+
+DASHBOARD_URL = reverse("dashboard:owner")
+BULK_URL = reverse("reservation:reservation-bulk")
+
+
+def reservation_detail_url(reservation_id):
+    """Create and return a reservation detail URL."""
+    return reverse("reservation:reservation-detail", args=[reservation_id])
+
+
+def payment_url(reservation_id):
+    """Create and return a payment URL for a reservation."""
+    return reverse("reservation:reservation-payment-list", args=[reservation_id])
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_property(owner=None, **kwargs):
+    """Create and return a property."""
+    default = {"name": "test name", "location": "loc", "price": Decimal("3.5")}
+    default.update(kwargs)
+    return Property.objects.create(owner=owner, **default)
+
+
+def get_days(property):
+    """Return the rollup rows of a property as ``{day: (nights, revenue, reviews)}``."""
+    return {
+        day.day: (day.nights, day.revenue, day.reviews)
+        for day in PropertyDay.objects.filter(property=property)
+    }
+
+
+class PublicDashboardApiTests(TestCase):
+    """Test unauthenticated dashboard requests."""
+
+    def test_auth_required(self):
+        """Test auth is required to read the dashboard."""
+        res = APIClient().get(DASHBOARD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RollupTests(TestCase):
+    """Test the rollup follows reservations, payments and reviews."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="test@example.com", password="Test123")
+        self.client.force_authenticate(self.user)
+        self.property = create_property()
+
+    def test_reservation_adds_and_removes_nights(self):
+        """Test booking counts one night per day and cancelling removes them."""
+        payload = {
+            "property": self.property.id,
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-03",
+        }
+        res = self.client.post(reverse("reservation:reservation-list"), payload)
+
+        self.assertEqual(
+            get_days(self.property),
+            {
+                date(2024, 1, 1): (1, Decimal("0.00"), 0),
+                date(2024, 1, 2): (1, Decimal("0.00"), 0),
+            },
+        )
+
+        self.client.delete(reservation_detail_url(res.data["id"]))
+
+        nights = {day: values[0] for day, values in get_days(self.property).items()}
+        self.assertEqual(nights, {date(2024, 1, 1): 0, date(2024, 1, 2): 0})
+
+    def test_bulk_reservations(self):
+        """Test bulk inserted reservations are rolled up."""
+        other = create_property()
+        items = [
+            {
+                "property": self.property.id,
+                "start_date": date(2024, 1, day),
+                "end_date": date(2024, 1, day + 1),
+            }
+            for day in (1, 2, 3)
+        ]
+        items.append(
+            {"property": other.id, "start_date": "2024-01-01", "end_date": "2024-01-04"}
+        )
+
+        res = self.client.post(BULK_URL, {"reservations": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        for property in (self.property, other):
+            nights = {day: values[0] for day, values in get_days(property).items()}
+            self.assertEqual(nights, {date(2024, 1, day): 1 for day in (1, 2, 3)})
+
+    def test_payment_adds_revenue(self):
+        """Test a payment adds its amount on the day it was made."""
+        reservation = Reservation.objects.create(
+            property=self.property,
+            user=self.user,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 1),
+        )
+        payload = {
+            "reservation": reservation.id,
+            "amount": "120.50",
+            "payment_method": "card",
+        }
+
+        res = self.client.post(payment_url(reservation.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            get_days(self.property),
+            {timezone.now().date(): (0, Decimal("120.50"), 0)},
+        )
+
+        reservation.delete()
+
+        self.assertEqual(
+            get_days(self.property), {timezone.now().date(): (0, Decimal("0.00"), 0)}
+        )
+
+    def test_review_counted(self):
+        """Test a review is counted on the day it was written."""
+        Review.objects.create(property=self.property, user=self.user, rating=4)
+
+        self.assertEqual(
+            get_days(self.property), {timezone.now().date(): (0, Decimal("0.00"), 1)}
+        )
+
+    def test_property_delete_removes_rows(self):
+        """Test deleting a property deletes its rollup rows."""
+        Reservation.objects.create(
+            property=self.property,
+            user=self.user,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+        )
+        Review.objects.create(property=self.property, user=self.user, rating=4)
+
+        self.property.delete()
+
+        self.assertFalse(PropertyDay.objects.exists())
+
+
+class OwnerDashboardApiTests(TestCase):
+    """Test the owner dashboard endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user(email="owner@example.com", password="Test123")
+        self.guest = create_user(email="guest@example.com", password="Test123")
+        self.client.force_authenticate(self.owner)
+
+    def book(self, property, start_day, end_day):
+        """Book a January 2024 stay for the guest."""
+        return Reservation.objects.create(
+            property=property,
+            user=self.guest,
+            start_date=date(2024, 1, start_day),
+            end_date=date(2024, 1, end_day),
+        )
+
+    def test_dashboard(self):
+        """Test totals per property and overall within the date range."""
+        first = create_property(owner=self.owner, name="First")
+        second = create_property(owner=self.owner, name="Second")
+        self.book(first, 1, 4)
+        self.book(first, 8, 12)
+        self.book(create_property(owner=self.guest), 1, 10)
+        PropertyDay.objects.filter(property=first, day=date(2024, 1, 1)).update(
+            revenue=Decimal("99.00"), reviews=1
+        )
+        PropertyDay.objects.filter(property=first, day=date(2024, 1, 2)).update(
+            revenue=Decimal("300.00"), reviews=2
+        )
+        params = {"start_date": "2024-01-02", "end_date": "2024-01-10"}
+
+        with self.assertNumQueries(1):
+            res = self.client.get(DASHBOARD_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["days"], 8)
+        self.assertEqual(
+            [dict(row) for row in res.data["properties"]],
+            [
+                {
+                    "id": first.id,
+                    "name": "First",
+                    "nights": 4,
+                    "occupancy": 0.5,
+                    "revenue": "300.00",
+                    "reviews": 2,
+                },
+                {
+                    "id": second.id,
+                    "name": "Second",
+                    "nights": 0,
+                    "occupancy": 0.0,
+                    "revenue": "0.00",
+                    "reviews": 0,
+                },
+            ],
+        )
+        self.assertEqual(
+            dict(res.data["totals"]),
+            {"nights": 4, "occupancy": 0.25, "revenue": "300.00", "reviews": 2},
+        )
+
+    def test_dashboard_without_properties(self):
+        """Test users owning no property get empty totals."""
+        self.client.force_authenticate(self.guest)
+        params = {"start_date": "2024-01-01", "end_date": "2024-02-01"}
+
+        res = self.client.get(DASHBOARD_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["properties"], [])
+        self.assertEqual(res.data["totals"]["occupancy"], 0.0)
+
+    def test_invalid_range(self):
+        """Test empty, reversed and too long ranges are rejected."""
+        for params in (
+            {"start_date": "2024-01-02"},
+            {"start_date": "2024-01-02", "end_date": "2024-01-02"},
+            {"start_date": "2024-01-02", "end_date": "2024-01-01"},
+            {"start_date": "2020-01-01", "end_date": "2024-01-01"},
+        ):
+            res = self.client.get(DASHBOARD_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,14 @@
+"""
+URL mappings for the dashboard API.
+"""
+
+from django.urls import path
+
+from dashboard import views
+
+
+app_name = "dashboard"
+
+urlpatterns = [
+    path("owner/", views.OwnerDashboardView.as_view(), name="owner"),
+]
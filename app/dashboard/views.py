@@ -0,0 +1,72 @@
+"""
+Views for the dashboard API.
+"""
+
+from decimal import Decimal
+
+from django.db.models import FilteredRelation, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from dashboard import serializers
+from property.models import Property
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
+
+
+class OwnerDashboardView(generics.GenericAPIView):
+    """Nights booked, occupancy, revenue and reviews of the user's properties."""
+
+    serializer_class = serializers.DashboardSerializer
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query = serializers.DashboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start_date = query.validated_data["start_date"]
+        end_date = query.validated_data["end_date"]
+        days = (end_date - start_date).days
+
+        # The join only reaches the rollup rows inside the range, at most one
+        # per property and day.
+        properties = list(
+            Property.objects.filter(owner=request.user)
+            .alias(
+                period=FilteredRelation(
+                    "days",
+                    condition=Q(days__day__gte=start_date, days__day__lt=end_date),
+                )
+            )
+            .annotate(
+                nights=Coalesce(Sum("period__nights"), 0),
+                revenue=Coalesce(Sum("period__revenue"), Value(Decimal(0))),
+                reviews=Coalesce(Sum("period__reviews"), 0),
+            )
+            .order_by("id")
+            .values("id", "name", "nights", "revenue", "reviews")
+        )
+        totals = {
+            field: sum((row[field] for row in properties), start)
+            for field, start in (("nights", 0), ("revenue", Decimal(0)), ("reviews", 0))
+        }
+        for row in properties:
+            row["occupancy"] = round(row["nights"] / days, 4)
+        capacity = days * len(properties)
+        totals["occupancy"] = round(totals["nights"] / capacity, 4) if capacity else 0.0
+
+        serializer = self.get_serializer(
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "days": days,
+                "totals": totals,
+                "properties": properties,
+            }
+        )
+        return Response(serializer.data)
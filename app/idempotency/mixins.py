@@ -0,0 +1,98 @@
+"""
+Idempotent create support for viewsets.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from config.exceptions import Conflict, UnprocessableEntity, is_constraint_violation
+from idempotency.models import KEY_CONSTRAINT, IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def get_request_hash(request):
+    """Return a fingerprint of the method, path and body of a request."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    payload = "\n".join([request.method, request.path, body])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    Replay the stored response when a create is retried with the same
+    ``Idempotency-Key`` header.
+
+    The key row is inserted in the same transaction as the created object,
+    so a retry either sees the committed response or waits on the unique
+    constraint until the first request finishes. Failed requests roll the
+    key back and may be retried. Keys are kept for ``IDEMPOTENCY_KEY_TTL``
+    seconds and removed by the ``sweep_idempotency_keys`` command.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {HEADER: _("Ensure this header has no more than 255 characters.")}
+            )
+
+        request_hash = get_request_hash(request)
+        stored = self._get_stored(request.user, key)
+        if stored is not None:
+            return self._replay(stored, request_hash)
+
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=key,
+                    request_hash=request_hash,
+                    expires_at=timezone.now()
+                    + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+                response = super().create(request, *args, **kwargs)
+                record.status_code = response.status_code
+                record.response_body = response.data
+                record.save(update_fields=["status_code", "response_body"])
+        except IntegrityError as error:
+            if not is_constraint_violation(error, KEY_CONSTRAINT):
+                raise
+            stored = self._get_stored(request.user, key)
+            if stored is None:
+                raise Conflict(_("A request with this Idempotency-Key is in progress."))
+            return self._replay(stored, request_hash)
+
+        return response
+
+    def _get_stored(self, user, key):
+        """Return the live stored key, dropping an expired one."""
+        stored = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if stored is not None and stored.expires_at <= timezone.now():
+            stored.delete()
+            return None
+        return stored
+
+    def _replay(self, stored, request_hash):
+        if stored.request_hash != request_hash:
+            raise UnprocessableEntity(
+                _("Idempotency-Key was already used with a different request.")
+            )
+        return Response(
+            stored.response_body,
+            status=stored.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
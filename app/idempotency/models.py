@@ -0,0 +1,31 @@
+"""
+Idempotency key models.
+"""
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+KEY_CONSTRAINT = "idempotency_key_unique_per_user"
+
+
+class IdempotencyKey(models.Model):
+    """Response stored for a client supplied Idempotency-Key."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name=KEY_CONSTRAINT),
+        ]
+
+    def __str__(self):
+        return f"{self.key} by {self.user_id}"
@@ -0,0 +1,101 @@
+"""
+Tests for Idempotency-Key handling.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from idempotency.models import IdempotencyKey
+from property.models import Property
+from reservation.models import Reservation
+
+RESERVATION_URL = reverse("reservation:reservation-list")
+
+
+def create_user(email="test@example.com", password="Test123"):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email=email, password=password)
+
+
+class IdempotencyKeyApiTests(TestCase):
+    """Test idempotent create requests."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.property = Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        self.payload = {
+            "property": self.property.id,
+            "start_date": date.today(),
+            "end_date": date.today() + timedelta(days=1),
+        }
+
+    def post(self, payload, key="key-1"):
+        return self.client.post(RESERVATION_URL, payload, HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_key_stored_with_response(self):
+        """Test the response is stored with the created object."""
+        res = self.post(self.payload)
+
+        record = IdempotencyKey.objects.get(user=self.user, key="key-1")
+        self.assertEqual(record.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(record.response_body["id"], res.data["id"])
+        self.assertGreater(record.expires_at, timezone.now())
+
+    def test_key_reused_with_different_request(self):
+        """Test reusing a key for another payload returns 422."""
+        self.post(self.payload)
+        self.payload["end_date"] = date.today() + timedelta(days=4)
+
+        res = self.post(self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_failed_request_not_stored(self):
+        """Test a rejected request can be retried with the same key."""
+        invalid = dict(self.payload, end_date=date.today() - timedelta(days=1))
+        res = self.post(invalid)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.post(self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_keys_scoped_per_user(self):
+        """Test the same key from another user creates a separate object."""
+        self.post(self.payload)
+        other = create_user(email="other@example.com")
+        self.client.force_authenticate(other)
+        payload = dict(
+            self.payload,
+            start_date=date.today() + timedelta(days=5),
+            end_date=date.today() + timedelta(days=6),
+        )
+
+        res = self.post(payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_expired_key_runs_request_again(self):
+        """Test a key past its replay window is treated as new."""
+        self.post(self.payload)
+        Reservation.objects.all().delete()
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+
+        res = self.post(self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", res)
+        self.assertEqual(Reservation.objects.count(), 1)
@@ -2,20 +2,80 @@
 Reservation models.
 """
 
-from django.db import models
+from django.db import connections, models
+from django.utils import timezone
 
 from reservation.models import Reservation
 
+UNIQUE_RESERVATION_CONSTRAINT = "payment_unique_reservation"
+
+
+class PaymentQuerySet(models.QuerySet):
+    """Queries for payments."""
+
+    def create_for_user(self, user, reservation_id, **fields):
+        """
+        Create a payment for one of the user's reservations in one query.
+
+        Ownership is checked by the INSERT ... SELECT and uniqueness by
+        ON CONFLICT, so concurrent requests never block on an error path.
+        Returns None when the reservation is missing, not the user's, or
+        already paid.
+        """
+        payment = self.model(reservation_id=reservation_id, **fields)
+        payment.created_at = payment.updated_at = timezone.now()
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        columns = [
+            self.model._meta.get_field(name)
+            for name in ("amount", "payment_method", "created_at", "updated_at")
+        ]
+        sql = (
+            f"INSERT INTO {qn(self.model._meta.db_table)} "
+            f"({qn('reservation_id')}, {', '.join(qn(f.column) for f in columns)}) "
+            f"SELECT {qn('id')}, {', '.join(['%s'] * len(columns))} "
+            f"FROM {qn(Reservation._meta.db_table)} "
+            f"WHERE {qn('id')} = %s AND {qn('user_id')} = %s "
+            f"ON CONFLICT ({qn('reservation_id')}) DO NOTHING RETURNING {qn('id')}"
+        )
+        params = [
+            field.get_db_prep_save(getattr(payment, field.attname), connection)
+            for field in columns
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [reservation_id, user.pk])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        payment.pk = row[0]
+        payment._state.adding = False
+        payment._state.db = self.db
+        return payment
+
 
 class Payment(models.Model):
     """Payment object."""
 
     reservation = models.ForeignKey(
-        Reservation, on_delete=models.CASCADE, related_name="payments"
+        Reservation,
+        on_delete=models.CASCADE,
+        related_name="payments",
+        db_index=False,
     )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_method = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PaymentQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reservation"], name=UNIQUE_RESERVATION_CONSTRAINT
+            ),
+        ]
 
     def __str__(self):
         return f"{self.pk} for {self.reservation} by {self.reservation.user}, cost: {self.amount}"
@@ -6,15 +6,16 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from config.fieldsets import SparseFieldsSerializerMixin
 from payment.models import Payment
-from reservation.models import Reservation
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for payment."""
 
     amount = serializers.DecimalField(max_digits=10, decimal_places=2)
-    reservation = serializers.PrimaryKeyRelatedField(queryset=Reservation.objects.all())
+    # Ownership and uniqueness are checked by the database when creating.
+    reservation = serializers.IntegerField(source="reservation_id", min_value=1)
 
     class Meta:
         model = Payment
@@ -26,10 +27,3 @@ class PaymentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Amount must be greater than zero.")
 
         return value
-
-    def validate_reservation(self, value):
-        if Payment.objects.filter(reservation=value).exists():
-            raise serializers.ValidationError(
-                "There is already a payment for this reservation."
-            )
-        return value
@@ -12,6 +12,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 from datetime import date
+import csv
 
 from reservation.models import Reservation
 from property.models import Property
@@ -98,7 +99,9 @@ class PrivatePaymentApiTests(TestCase):
     def test_retrieving_payments(self):
         """Test retrieving a list of payments."""
         create_payment(reservation=self.reservation)
-        create_payment(reservation=self.reservation)
+        create_payment(
+            reservation=create_reservation(property=self.property, user=self.user)
+        )
 
         url = get_payment_url(self.reservation.id)
         res = self.client.get(url)
@@ -114,7 +117,9 @@ class PrivatePaymentApiTests(TestCase):
         other_reservation = create_reservation(property=self.property, user=other_user)
         create_payment(reservation=other_reservation)
         create_payment(reservation=self.reservation)
-        create_payment(reservation=self.reservation)
+        create_payment(
+            reservation=create_reservation(property=self.property, user=self.user)
+        )
 
         url = get_payment_url(self.reservation.id)
         res = self.client.get(url)
@@ -173,6 +178,37 @@ class PrivatePaymentApiTests(TestCase):
         exists = Payment.objects.filter(reservation=payload["reservation"]).exists()
         self.assertTrue(exists)
 
+    def test_create_payment_single_query(self):
+        """Test creating a payment checks ownership and uniqueness in one query."""
+        payload = {
+            "reservation": self.reservation.id,
+            "amount": "4800.00",
+            "payment_method": "Credit Card",
+        }
+        url = get_payment_url(self.reservation.id)
+
+        with self.assertNumQueries(1):
+            res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        payment = Payment.objects.get(reservation=self.reservation)
+        self.assertEqual(res.data, PaymentSerializer(payment).data)
+
+    def test_create_payment_for_other_users_reservation(self):
+        """Test paying for another user's reservation returns 404."""
+        other_user = create_user(email="test1@example.com")
+        other_reservation = create_reservation(property=self.property, user=other_user)
+        payload = {
+            "reservation": other_reservation.id,
+            "amount": "50.00",
+            "payment_method": "Credit Card",
+        }
+        url = get_payment_url(other_reservation.id)
+        res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Payment.objects.exists())
+
     def test_create_payment_negative_amount_error(self):
         """Test that creating a payment with invalid amount failed."""
         payload = {
@@ -198,10 +234,11 @@ class PrivatePaymentApiTests(TestCase):
         url = get_payment_url(self.reservation.id)
         res = self.client.post(url, payload, format="json")
 
-        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Payment.objects.count(), 1)
 
     def test_create_payment_with_invalid_reservation(self):
-        """Test creating a payment with an invalid reservation ID."""
+        """Test creating a payment for a missing reservation returns 404."""
         invalid_reservation_id = 99999
         payload = {
             "reservation": invalid_reservation_id,
@@ -211,7 +248,7 @@ class PrivatePaymentApiTests(TestCase):
         url = get_payment_url(invalid_reservation_id)
         res = self.client.post(url, payload, format="json")
 
-        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_create_payment_without_payment_method(self):
         """Test creating a payment without a payment method."""
@@ -236,3 +273,50 @@ class PrivatePaymentApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("amount", res.data)
+
+    def test_conditional_get_payments(self):
+        """Test payment list returns 304 when nothing changed."""
+        create_payment(reservation=self.reservation)
+        url = get_payment_url(self.reservation.id)
+        res = self.client.get(url)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_create_payment_idempotent_retry(self):
+        """Test a retried payment replays the stored response, not a 400."""
+        payload = {
+            "reservation": self.reservation.id,
+            "amount": "4800.00",
+            "payment_method": "Credit Card",
+        }
+        url = get_payment_url(self.reservation.id)
+        res = self.client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="k1")
+
+        with self.assertNumQueries(1):
+            retry = self.client.post(
+                url, payload, format="json", HTTP_IDEMPOTENCY_KEY="k1"
+            )
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, res.data)
+        self.assertEqual(
+            Payment.objects.filter(reservation=self.reservation).count(), 1
+        )
+
+    def test_export_payments_csv(self):
+        """Test exporting the user's payments as CSV."""
+        payment = create_payment(reservation=self.reservation)
+        url = reverse(
+            "reservation:reservation-payment-export", args=[self.reservation.id]
+        )
+
+        res = self.client.get(url, HTTP_ACCEPT="text/csv")
+
+        content = b"".join(res.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(payment.id))
+        self.assertEqual(rows[0]["amount"], "1200.00")
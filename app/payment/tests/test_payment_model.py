@@ -4,6 +4,7 @@ Tests for payment model.
 
 from decimal import Decimal
 
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -42,3 +43,24 @@ class PaymentModelTest(TestCase):
             str(payment),
             f"{payment.pk} for {reservation} by {reservation.user}, cost: {payment.amount}",
         )
+
+    def test_one_payment_per_reservation(self):
+        """Test the database rejects a second payment for a reservation."""
+        user = get_user_model().objects.create_user(
+            email="Test@example.com", password="Test123"
+        )
+        property = Property.objects.create(name="Warsaw Hotel", price=Decimal("3.5"))
+        reservation = Reservation.objects.create(
+            property=property,
+            user=user,
+            start_date=date.today(),
+            end_date=date.today(),
+        )
+        Payment.objects.create(
+            reservation=reservation, amount=225.50, payment_method="PayPal"
+        )
+
+        with self.assertRaises(IntegrityError):
+            Payment.objects.create(
+                reservation=reservation, amount=225.50, payment_method="PayPal"
+            )
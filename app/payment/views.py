@@ -2,24 +2,44 @@
 Views for payment API.
 """
 
-from django.shortcuts import get_object_or_404
-
+from rest_framework.exceptions import NotFound
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from config.conditional import ConditionalGetMixin
+from config.export import ExportMixin
+from config.fieldsets import SparseFieldsMixin
+from config.exceptions import Conflict
+from idempotency.mixins import IdempotentCreateMixin
 from reservation.models import Reservation
 from payment import models, serializers
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
 
 
-class PaymentViewSet(ModelViewSet):
+class PaymentViewSet(
+    ConditionalGetMixin,
+    IdempotentCreateMixin,
+    SparseFieldsMixin,
+    ExportMixin,
+    ModelViewSet,
+):
     """View for manage payment APIs."""
 
     http_method_names = ["get", "post"]
     serializer_class = serializers.PaymentSerializer
     queryset = models.Payment.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    export_fields = (
+        "id",
+        "reservation",
+        "amount",
+        "payment_method",
+        "created_at",
+    )
 
     def get_queryset(self):
         """Retrieve payments for authenticated user."""
@@ -28,8 +48,26 @@ class PaymentViewSet(ModelViewSet):
 
     def perform_create(self, serializer):
         """Create a new payment for a reservation linked to the authenticated user."""
-        reservation_id = self.kwargs.get("reservation_id")
-        reservation = get_object_or_404(
-            Reservation, pk=reservation_id, user=self.request.user
+        reservation_id = int(self.kwargs["reservation_id"])
+        fields = {
+            name: value
+            for name, value in serializer.validated_data.items()
+            if name != "reservation_id"
+        }
+        payment = models.Payment.objects.create_for_user(
+            self.request.user, reservation_id, **fields
+        )
+        if payment is None:
+            self._raise_create_error(reservation_id)
+        serializer.instance = payment
+
+    def _raise_create_error(self, reservation_id):
+        """Explain why no payment was inserted; only runs on the error path."""
+        owner = (
+            Reservation.objects.filter(pk=reservation_id)
+            .values_list("user_id", flat=True)
+            .first()
         )
-        serializer.save(reservation=reservation)
+        if owner != self.request.user.pk:
+            raise NotFound()
+        raise Conflict("There is already a payment for this reservation.")
@@ -0,0 +1,139 @@
+"""
+Batched availability lookups for search result pages.
+
+Each property's answer for a date window is cached under the property's
+cache version, which every write to the property, its reservations or its
+holds bumps, so entries never outlive the data they were computed from.
+Answers blocked only by a hold are kept no longer than the hold lasts. All
+misses of a batch are answered with one query.
+"""
+
+import math
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+
+from property.cache import get_versions
+from property.models import Property
+from reservation.models import Hold, Reservation
+
+
+def get_availability_key(property_id, version, start_date, end_date):
+    """Build the cache key for a property's availability in a date window."""
+    return (
+        f"property:availability:{property_id}:{version}:"
+        f"{start_date.isoformat()}:{end_date.isoformat()}"
+    )
+
+
+def redact_conflict(user, owner_id, conflict):
+    """
+    Return the part of a cached conflict that user may see.
+
+    The reservation id is only shown to the property's owner and to the
+    guest who made the reservation; anyone else sees just the dates.
+    """
+    if conflict is None or "user_id" not in conflict:
+        return conflict
+    if user.pk is not None and user.pk in (owner_id, conflict["user_id"]):
+        return {key: value for key, value in conflict.items() if key != "user_id"}
+    return {"start_date": conflict["start_date"], "end_date": conflict["end_date"]}
+
+
+def get_conflicts(user, property_ids, start_date, end_date):
+    """
+    Return ``{property_id: conflict}`` for the properties visible to user.
+
+    ``conflict`` is the first reservation overlapping ``[start_date,
+    end_date)`` as a dict, else the first active hold with its
+    ``held_until``, or None when the property is free. Unknown ids and
+    properties of other owners are left out, and other guests'
+    reservations are reduced to their dates.
+    """
+    property_ids = list(dict.fromkeys(property_ids))
+    versions = get_versions(property_ids)
+    keys = {
+        property_id: get_availability_key(
+            property_id, versions[property_id], start_date, end_date
+        )
+        for property_id in property_ids
+    }
+    cached = cache.get_many(keys.values())
+    entries = {
+        property_id: cached[key] for property_id, key in keys.items() if key in cached
+    }
+
+    missing = [
+        property_id for property_id in property_ids if property_id not in entries
+    ]
+    if missing:
+        first = (
+            Reservation.objects.overlapping(start_date, end_date)
+            .filter(property=OuterRef("pk"))
+            .order_by("start_date", "id")
+            .values(
+                json=JSONObject(
+                    id="id",
+                    user_id="user_id",
+                    start_date="start_date",
+                    end_date="end_date",
+                )
+            )[:1]
+        )
+        first_hold = (
+            Hold.objects.active()
+            .overlapping(start_date, end_date)
+            .filter(property=OuterRef("pk"))
+            .order_by("start_date", "id")
+            .values(
+                json=JSONObject(
+                    start_date="start_date",
+                    end_date="end_date",
+                    held_until="expires_at",
+                )
+            )[:1]
+        )
+        # Unknown ids are cached as None; creating the property bumps its
+        # version and orphans the entry.
+        fetched = dict.fromkeys(missing)
+        fetched.update(
+            (property_id, (owner_id, conflict or hold))
+            for property_id, owner_id, conflict, hold in Property.objects.filter(
+                pk__in=missing
+            )
+            .annotate(conflict=Subquery(first), hold=Subquery(first_hold))
+            .values_list("pk", "owner_id", "conflict", "hold")
+        )
+        held = {
+            property_id: entry
+            for property_id, entry in fetched.items()
+            if entry is not None and entry[1] and "held_until" in entry[1]
+        }
+        cache.set_many(
+            {
+                keys[property_id]: entry
+                for property_id, entry in fetched.items()
+                if property_id not in held
+            },
+            timeout=settings.PROPERTY_CACHE_TIMEOUT,
+        )
+        for property_id, entry in held.items():
+            # An expiring hold bumps nothing, so its answer expires with it.
+            remaining = (
+                datetime.fromisoformat(entry[1]["held_until"]) - timezone.now()
+            ).total_seconds()
+            timeout = min(settings.PROPERTY_CACHE_TIMEOUT, math.ceil(remaining))
+            if timeout > 0:
+                cache.set(keys[property_id], entry, timeout=timeout)
+        entries.update(fetched)
+
+    return {
+        property_id: redact_conflict(user, *entries[property_id])
+        for property_id in property_ids
+        if entries[property_id] is not None
+        and entries[property_id][0] in (None, user.pk)
+    }
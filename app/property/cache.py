@@ -0,0 +1,141 @@
+"""
+Versioned response cache for property API.
+
+Cached responses are keyed by a version counter: the global one for list
+responses and a per-property one for detail responses. Writes to a property
+or its reservations and reviews bump the counters, which orphans every stale
+entry at once instead of deleting keys one by one.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework.response import Response
+
+GLOBAL_VERSION_KEY = "property:version"
+STATS_KEYS = {True: "property:cache:hits", False: "property:cache:misses"}
+
+
+def _version_key(property_id=None):
+    if property_id is None:
+        return GLOBAL_VERSION_KEY
+    return f"{GLOBAL_VERSION_KEY}:{property_id}"
+
+
+def get_version(property_id=None):
+    """Return the current cache version for a property, or the global one."""
+    key = _version_key(property_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never restarts at a
+        # value that older cached entries were stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(property_ids):
+    """Return the cache versions of many properties in two cache round trips."""
+    keys = {_version_key(property_id): property_id for property_id in property_ids}
+    versions = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    seeds = {
+        key: time.time_ns()
+        for key, property_id in keys.items()
+        if property_id not in versions
+    }
+    if seeds:
+        # Unlike ``add``, a seed may overwrite a concurrent one; both are
+        # timestamps, so the version only moves forward and at worst orphans
+        # an entry that was just cached.
+        cache.set_many(seeds, timeout=None)
+        versions.update((keys[key], value) for key, value in seeds.items())
+    return versions
+
+
+def bump_version(property_id=None):
+    """Invalidate every response cached under the given version."""
+    key = _version_key(property_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate(property_id=None, include_global=True):
+    """
+    Bump the versions now and once more after the transaction commits.
+
+    The second bump drops anything a concurrent reader cached from the
+    pre-commit state in between.
+    """
+
+    def bump():
+        if property_id is not None:
+            bump_version(property_id)
+        if include_global:
+            bump_version()
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def record(hit):
+    """Count a cache hit or miss when ``PROPERTY_CACHE_STATS`` is enabled."""
+    if not settings.PROPERTY_CACHE_STATS:
+        return
+    key = STATS_KEYS[hit]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    """Return the cache hit and miss counters."""
+    values = cache.get_many(STATS_KEYS.values())
+    return {
+        "hits": values.get(STATS_KEYS[True], 0),
+        "misses": values.get(STATS_KEYS[False], 0),
+    }
+
+
+def get_response_key(request, action, version):
+    """Build the cache key for a response visible to the requesting user."""
+    url = hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+    return f"property:response:{action}:{request.user.pk}:{version}:{url}"
+
+
+class CachedResponseMixin:
+    """Serve list and retrieve responses from the versioned response cache."""
+
+    cache_timeout = settings.PROPERTY_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        version = get_version()
+        return self._get_cached_response(
+            version, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        version = get_version(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        return self._get_cached_response(
+            version, super().retrieve, request, *args, **kwargs
+        )
+
+    def _get_cached_response(self, version, handler, request, *args, **kwargs):
+        key = get_response_key(request, self.action, version)
+        data = cache.get(key)
+        record(hit=data is not None)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
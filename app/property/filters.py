@@ -2,19 +2,79 @@
 Filters for property API.
 """
 
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.validators import EMPTY_VALUES
+from django.db import connections
+from django.db.models import DecimalField, Q
+from django.db.models.functions import Cast
+from django.db.models.functions import Upper
 from django_filters import rest_framework as filters
 
 from property.models import Property
 
 
+def is_postgresql(queryset):
+    """Return True when the queryset runs against PostgreSQL."""
+    return connections[queryset.db].vendor == "postgresql"
+
+
+class TrigramFilter(filters.CharFilter):
+    """
+    Fuzzy text filter backed by a pg_trgm GIN index on UPPER(field).
+
+    Matches rows containing the value or a word similar to it above
+    ``pg_trgm.word_similarity_threshold``, which is set on every connection
+    from ``PROPERTY_SEARCH_SIMILARITY_THRESHOLD``. Falls back to
+    ``icontains`` on other database backends.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+
+        contains = Q(**{f"{self.field_name}__icontains": value})
+        if not is_postgresql(qs):
+            return qs.filter(contains)
+
+        similar = TrigramWordSimilar(Upper(self.field_name), value.upper())
+        return qs.filter(contains | Q(similar))
+
+
 class PropertyFilter(filters.FilterSet):
     """Filter class for propery queryset."""
 
-    name = filters.CharFilter(field_name="name", lookup_expr="icontains")
-    location = filters.CharFilter(field_name="location", lookup_expr="icontains")
+    name = TrigramFilter(field_name="name")
+    location = TrigramFilter(field_name="location")
     price_min = filters.NumberFilter(field_name="price", lookup_expr="gte")
     price_max = filters.NumberFilter(field_name="price", lookup_expr="lte")
 
     class Meta:
         model = Property
         fields = ["name", "location", "price"]
+
+    def filter_queryset(self, queryset):
+        """Filter the queryset and rank fuzzy matches by relevance."""
+        queryset = super().filter_queryset(queryset)
+        terms = [
+            (field.field_name, self.form.cleaned_data.get(name))
+            for name, field in self.filters.items()
+            if isinstance(field, TrigramFilter)
+        ]
+        terms = [(field, value) for field, value in terms if value]
+        if not terms or not is_postgresql(queryset):
+            return queryset
+
+        # The float4 similarity is rounded to an exact numeric so the keyset
+        # cursor can carry the rank and compare it without loss.
+        rank = Cast(
+            reduce(
+                add,
+                (TrigramWordSimilarity(value.upper(), Upper(f)) for f, value in terms),
+            ),
+            DecimalField(max_digits=8, decimal_places=6),
+        )
+        return queryset.annotate(search_rank=rank).order_by("-search_rank", "-id")
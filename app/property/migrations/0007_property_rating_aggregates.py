@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_ratings(apps, schema_editor):
+    """Populate the rating aggregates from the existing reviews."""
+    Property = apps.get_model("property", "Property")
+    Review = apps.get_model("review", "Review")
+    stars = range(1, 6)
+    stats = Review.objects.values("property").annotate(
+        count=Count("id"),
+        total=Sum("rating"),
+        **{f"rating_{s}_count": Count("id", filter=Q(rating=s)) for s in stars},
+    )
+    for row in stats.iterator():
+        Property.objects.filter(pk=row["property"]).update(
+            rating_count=row["count"],
+            rating_sum=row["total"],
+            rating_avg=round(row["total"] / row["count"], 2),
+            **{f"rating_{s}_count": row[f"rating_{s}_count"] for s in stars},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0006_property_trigram_indexes"),
+        ("review", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_avg",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["rating_avg", "id"], name="property_rating_avg_id_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0007_property_rating_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
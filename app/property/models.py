@@ -3,7 +3,54 @@ Properties models.
 """
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf, Now, Upper
+
+RATING_STARS = range(1, 6)
+
+
+class PropertyQuerySet(models.QuerySet):
+    """Queryset for properties."""
+
+    def visible_to(self, user):
+        """
+        Filter to properties owned by user or not owned by anyone.
+
+        Served by the ``(owner, -id)`` and partial public ``-id`` indexes.
+        """
+        return self.filter(Q(owner=user) | Q(owner__isnull=True))
+
+    def apply_rating(self, added=None, removed=None):
+        """
+        Adjust the rating aggregates in place for one review.
+
+        ``added`` is the rating of a created review (or the new rating of an
+        updated one) and ``removed`` the rating of a deleted review (or the
+        previous rating of an updated one). Counters never drop below zero,
+        so drifted rows stay valid until the aggregates are rebuilt.
+        """
+        deltas = {
+            "rating_count": (added is not None) - (removed is not None),
+            "rating_sum": (added or 0) - (removed or 0),
+        }
+        if added is not None:
+            deltas[f"rating_{added}_count"] = 1
+        if removed is not None:
+            field = f"rating_{removed}_count"
+            deltas[field] = deltas.get(field, 0) - 1
+
+        changes = {
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+        }
+        changes["rating_avg"] = Coalesce(
+            Cast(changes["rating_sum"], FloatField())
+            / NullIf(changes["rating_count"], 0),
+            Value(0.0),
+        )
+        return self.update(updated_at=Now(), **changes)
 
 
 class Property(models.Model):
@@ -19,7 +66,48 @@ class Property(models.Model):
         related_name="property",
         null=True,
         blank=True,
+        db_index=False,
     )
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PropertyQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "-id"], name="property_owner_id_desc_idx"),
+            models.Index(
+                fields=["-id"],
+                name="property_public_id_idx",
+                condition=Q(owner__isnull=True),
+            ),
+            models.Index(fields=["name", "id"], name="property_name_id_idx"),
+            models.Index(fields=["location", "id"], name="property_location_id_idx"),
+            models.Index(fields=["price", "id"], name="property_price_id_idx"),
+            models.Index(
+                fields=["rating_avg", "id"], name="property_rating_avg_id_idx"
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="property_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("location"), name="gin_trgm_ops"),
+                name="property_location_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    @property
+    def rating_histogram(self):
+        """Return the number of reviews per star rating."""
+        return {star: getattr(self, f"rating_{star}_count") for star in RATING_STARS}
@@ -2,20 +2,86 @@
 Serializers for property API View.
 """
 
+from django.conf import settings
+from django.db.models import Prefetch
+
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
-from property.models import Property
+from config.fieldsets import SparseFieldsSerializerMixin
+from config.pagination import KeysetPagination
+from property.models import RATING_STARS, Property
+from reservation.models import Reservation
 from reservation.serializers import ReservationSerializer
+from review.models import Review
 from review.serializers import ReviewSerializer
 
+NESTED_PAGE_SIZE = 10
+
+RESERVATION_ORDERING = ("start_date", "id")
+REVIEW_ORDERING = ("-id",)
+
+
+HISTOGRAM_COLUMNS = [(star, f"rating_{star}_count") for star in RATING_STARS]
+
+
+def get_rating_histogram(row):
+    """Return the rating histogram of a ``.values()`` property row."""
+    return {star: row[column] for star, column in HISTOGRAM_COLUMNS}
+
+
+def get_nested_prefetches(
+    user, expand=("reservations", "reviews"), page_size=NESTED_PAGE_SIZE
+):
+    """
+    Return prefetches loading the first page of each expanded collection.
+
+    Reservations are limited to the ones visible to user.
+    """
+    prefetches = []
+    if "reservations" in expand:
+        prefetches.append(
+            Prefetch(
+                "reservation_set",
+                queryset=Reservation.objects.visible_to(user).order_by(
+                    *RESERVATION_ORDERING
+                )[: page_size + 1],
+                to_attr="nested_reservations",
+            )
+        )
+    if "reviews" in expand:
+        prefetches.append(
+            Prefetch(
+                "review_set",
+                queryset=Review.objects.order_by(*REVIEW_ORDERING)[: page_size + 1],
+                to_attr="nested_reviews",
+            )
+        )
+    return prefetches
 
-class PropertySerializer(serializers.ModelSerializer):
+
+class PropertySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for property."""
 
     class Meta:
         model = Property
-        fields = ["id", "name", "location", "price", "owner"]
-        read_only_fields = ["id"]
+        fields = [
+            "id",
+            "name",
+            "location",
+            "price",
+            "owner",
+            "rating_avg",
+            "rating_count",
+            "rating_histogram",
+        ]
+        read_only_fields = ["id", "rating_avg", "rating_count"]
+        row_sources = {
+            "rating_histogram": (
+                [column for star, column in HISTOGRAM_COLUMNS],
+                get_rating_histogram,
+            )
+        }
 
     def validate_price(self, value):
         if value <= 0:
@@ -24,12 +90,16 @@ class PropertySerializer(serializers.ModelSerializer):
 
 
 class PropertyDetailSerializer(PropertySerializer):
-    """Serializer for detail property."""
+    """
+    Serializer for detail property.
 
-    reservations = ReservationSerializer(
-        many=True, read_only=True, source="reservation"
-    )
-    reviews = ReviewSerializer(many=True, read_only=True)
+    Reservations and reviews are only embedded when requested with
+    ``?expand=reservations,reviews``. Owners see every reservation of their
+    property, other users only their own.
+    """
+
+    reservations = serializers.SerializerMethodField()
+    reviews = serializers.SerializerMethodField()
 
     class Meta(PropertySerializer.Meta):
         fields = PropertySerializer.Meta.fields + [
@@ -37,3 +107,96 @@ class PropertyDetailSerializer(PropertySerializer):
             "reservations",
             "reviews",
         ]
+        expandable_fields = ["reservations", "reviews"]
+
+    def get_reservations(self, obj):
+        """
+        Return the first page of the reservations the requesting user may
+        see, with a link to the next.
+        """
+        rows = getattr(obj, "nested_reservations", None)
+        if rows is None:
+            rows = list(
+                Reservation.objects.visible_to(self.context["request"].user)
+                .filter(property=obj)
+                .order_by(*RESERVATION_ORDERING)[: NESTED_PAGE_SIZE + 1]
+            )
+        return self._get_nested_page(
+            obj,
+            rows=rows,
+            related="reservation_set",
+            ordering=RESERVATION_ORDERING,
+            serializer_class=ReservationSerializer,
+            url_name="property:property-reservations",
+        )
+
+    def get_reviews(self, obj):
+        """Return the first page of reviews with a link to the next."""
+        return self._get_nested_page(
+            obj,
+            rows=getattr(obj, "nested_reviews", None),
+            related="review_set",
+            ordering=REVIEW_ORDERING,
+            serializer_class=ReviewSerializer,
+            url_name="property:property-reviews-list",
+        )
+
+    def _get_nested_page(
+        self, obj, rows, related, ordering, serializer_class, url_name
+    ):
+        if rows is None:
+            manager = getattr(obj, related)
+            rows = list(manager.order_by(*ordering)[: NESTED_PAGE_SIZE + 1])
+
+        next_link = None
+        if len(rows) > NESTED_PAGE_SIZE:
+            rows = rows[:NESTED_PAGE_SIZE]
+            paginator = KeysetPagination()
+            paginator.page_size = NESTED_PAGE_SIZE
+            url = reverse(url_name, args=[obj.pk], request=self.context.get("request"))
+            next_link = paginator.build_next_link(url, rows[-1], ordering)
+
+        return {
+            "results": serializer_class(rows, many=True, context=self.context).data,
+            "next": next_link,
+        }
+
+
+class PropertyImportSerializer(PropertySerializer):
+    """
+    Serializer for one imported property row.
+
+    Relations are plain ids so validating a row runs no query; the import
+    checks owners in bulk.
+    """
+
+    id = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+    owner = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+
+    class Meta(PropertySerializer.Meta):
+        fields = ["id", "name", "location", "price", "description", "owner"]
+        read_only_fields = []
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """Serializer for the availability search query parameters."""
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        """Validate that start date is before end date."""
+        if attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError("End date must be after start date.")
+
+        return attrs
+
+
+class AvailabilityBatchSerializer(AvailabilityQuerySerializer):
+    """Serializer for an availability check of many properties."""
+
+    properties = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.AVAILABILITY_BATCH_MAX_SIZE,
+    )
@@ -0,0 +1,36 @@
+"""
+Signal handlers invalidating the property response cache.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from property.cache import invalidate
+
+
+@receiver(post_save, sender="property.Property")
+@receiver(post_delete, sender="property.Property")
+def invalidate_property(sender, instance, **kwargs):
+    """Drop cached list responses and the property's detail responses."""
+    invalidate(instance.pk)
+
+
+@receiver(post_save, sender="reservation.Reservation")
+@receiver(post_delete, sender="reservation.Reservation")
+def invalidate_property_reservations(sender, instance, **kwargs):
+    """Drop cached detail responses embedding the property's reservations."""
+    invalidate(instance.property_id, include_global=False)
+
+
+@receiver(post_save, sender="reservation.Hold")
+@receiver(post_delete, sender="reservation.Hold")
+def invalidate_property_holds(sender, instance, **kwargs):
+    """Drop cached availability answers that a hold blocks or frees."""
+    invalidate(instance.property_id, include_global=False)
+
+
+@receiver(post_save, sender="review.Review")
+@receiver(post_delete, sender="review.Review")
+def invalidate_property_reviews(sender, instance, **kwargs):
+    """Drop cached responses showing the property's reviews and ratings."""
+    invalidate(instance.property_id)
@@ -2,24 +2,46 @@
 Tests for property API.
 """
 
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from unittest import skipUnless
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
+from config import renderers
+
+from property import cache
 from property.models import Property
+from reservation import occupancy
+from reservation.models import Hold, Reservation
+from review.models import Review
 
 from property.serializers import (
+    NESTED_PAGE_SIZE,
     PropertySerializer,
     PropertyDetailSerializer,
 )
 
 
 PROPERTY_URL = reverse("property:property-list")
+AVAILABLE_URL = reverse("property:property-available")
+AVAILABILITY_URL = reverse("property:property-availability")
+EXPORT_URL = reverse("property:property-export")
 
 
 def detail_url(property_id):
@@ -315,3 +337,805 @@ class PrivatePropertiesAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
+
+    def test_list_unpaginated_without_page_size(self):
+        """Test list returns a plain list unless pagination is requested."""
+        create_property(owner=self.user)
+
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+
+    def test_paginate_properties_with_cursor(self):
+        """Test walking the property list page by page with cursors."""
+        for i in range(5):
+            create_property(owner=self.user, name=f"property{i}")
+
+        res = self.client.get(PROPERTY_URL, {"page_size": 2})
+
+        properties = Property.objects.all().order_by("-id")
+        serializer = PropertySerializer(properties, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], serializer.data[:2])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"], serializer.data[2:4])
+
+        last = self.client.get(res.data["next"])
+        self.assertEqual(last.data["results"], serializer.data[4:])
+        self.assertIsNone(last.data["next"])
+
+        res = self.client.get(last.data["previous"])
+        self.assertEqual(res.data["results"], serializer.data[2:4])
+
+    def test_paginate_properties_ordered_by_price_with_ties(self):
+        """Test cursor pagination on a non-unique ordering column."""
+        for price in ["5.00", "1.00", "5.00", "5.00", "2.00"]:
+            create_property(price=Decimal(price))
+
+        results = []
+        params = {"page_size": 2, "ordering": "price"}
+        res = self.client.get(PROPERTY_URL, params)
+        while True:
+            results.extend(res.data["results"])
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        properties = Property.objects.all().order_by("price", "id")
+        serializer = PropertySerializer(properties, many=True)
+        self.assertEqual(results, serializer.data)
+
+    def test_paginated_list_runs_single_query(self):
+        """Test a paginated page does not issue a COUNT query."""
+        for i in range(3):
+            create_property(owner=self.user)
+        first = self.client.get(PROPERTY_URL, {"page_size": 1})
+
+        with self.assertNumQueries(1):
+            res = self.client.get(first.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_invalid_cursor_returns_404(self):
+        """Test a malformed cursor is rejected."""
+        res = self.client.get(PROPERTY_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_from_other_ordering_returns_404(self):
+        """Test a cursor whose values do not fit the ordering is rejected."""
+        for i in range(3):
+            create_property(owner=self.user, name=f"property{i}")
+        res = self.client.get(PROPERTY_URL, {"page_size": 1, "ordering": "name"})
+        cursor = parse_qs(urlparse(res.data["next"]).query)["cursor"][0]
+
+        res = self.client.get(
+            PROPERTY_URL, {"page_size": 1, "ordering": "price", "cursor": cursor}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_property_by_name_fuzzy(self):
+        """Test name search tolerates typos and ranks closer matches first."""
+        exact = create_property(name="Warsaw Hotel")
+        close = create_property(name="Warszawa Inn")
+        create_property(name="Paris Amela")
+
+        res = self.client.get(PROPERTY_URL, {"name": "warsaw"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in res.data]
+        self.assertEqual(ids, [exact.id, close.id])
+
+    def test_ranked_search_pages_through_every_row(self):
+        """Test a cursor walks all matches of a search with equal ranks."""
+        expected = {create_property(name="Warsaw Hotel").id for _ in range(6)}
+
+        ids = []
+        params = {"name": "Warsa", "page_size": 2}
+        while True:
+            res = self.client.get(PROPERTY_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                break
+            cursor = parse_qs(urlparse(res.data["next"]).query)["cursor"][0]
+            params = {"name": "Warsa", "page_size": 2, "cursor": cursor}
+
+        self.assertEqual(len(ids), 6)
+        self.assertEqual(set(ids), expected)
+
+    def test_search_falls_back_to_icontains(self):
+        """Test name search uses a plain substring match off PostgreSQL."""
+        match = create_property(name="Warsaw Hotel")
+        create_property(name="Warszawa Inn")
+
+        with patch("property.filters.is_postgresql", return_value=False):
+            res = self.client.get(PROPERTY_URL, {"name": "warsaw"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data], [match.id])
+
+    def test_search_similarity_threshold_from_settings(self):
+        """Test connections use the configured similarity threshold."""
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+            threshold = float(cursor.fetchone()[0])
+
+        self.assertEqual(threshold, settings.PROPERTY_SEARCH_SIMILARITY_THRESHOLD)
+
+    def test_available_properties(self):
+        """Test listing properties free for a date range."""
+        free = create_property(name="Free Hotel")
+        booked = create_property(name="Booked Hotel")
+        adjacent = create_property(name="Adjacent Hotel")
+        start = date(2024, 7, 10)
+        Reservation.objects.create(
+            property=booked,
+            user=self.user,
+            start_date=start + timedelta(days=2),
+            end_date=start + timedelta(days=5),
+        )
+        Reservation.objects.create(
+            property=adjacent,
+            user=self.user,
+            start_date=start - timedelta(days=3),
+            end_date=start,
+        )
+
+        res = self.client.get(
+            AVAILABLE_URL, {"start": start, "end": start + timedelta(days=3)}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in res.data]
+        self.assertIn(free.id, ids)
+        self.assertIn(adjacent.id, ids)
+        self.assertNotIn(booked.id, ids)
+
+    def test_available_properties_with_filters(self):
+        """Test availability search honors the property filters."""
+        cheap = create_property(price=Decimal("50.00"))
+        create_property(price=Decimal("500.00"))
+
+        res = self.client.get(
+            AVAILABLE_URL,
+            {"start": "2024-07-10", "end": "2024-07-12", "price_max": 100},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data], [cheap.id])
+
+    def test_available_properties_in_window(self):
+        """Test availability inside the bitmap window is exact to the night."""
+        free = create_property(name="Free Hotel")
+        booked = create_property(name="Booked Hotel")
+        adjacent = create_property(name="Adjacent Hotel")
+        start = occupancy.get_origin() + timedelta(days=10)
+        Reservation.objects.create(
+            property=booked,
+            user=self.user,
+            start_date=start + timedelta(days=2),
+            end_date=start + timedelta(days=5),
+        )
+        Reservation.objects.create(
+            property=adjacent,
+            user=self.user,
+            start_date=start - timedelta(days=3),
+            end_date=start,
+        )
+
+        res = self.client.get(
+            AVAILABLE_URL, {"start": start, "end": start + timedelta(days=3)}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in res.data]
+        self.assertEqual(ids, [adjacent.id, free.id])
+
+    def test_property_occupancy(self):
+        """Test reporting the booked nights of one property."""
+        property = create_property(owner=self.user)
+        start = occupancy.get_origin() + timedelta(days=10)
+        Reservation.objects.create(
+            property=property,
+            user=self.user,
+            start_date=start + timedelta(days=2),
+            end_date=start + timedelta(days=4),
+        )
+        url = reverse("property:property-occupancy", args=[property.id])
+
+        for params in (
+            {"start": start, "end": start + timedelta(days=3)},
+            {"start": date(2024, 7, 1), "end": date(2024, 7, 5)},
+        ):
+            res = self.client.get(url, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data["available"], params["start"] != start)
+
+        res = self.client.get(url, {"start": start, "end": start + timedelta(days=3)})
+        self.assertEqual(res.data["booked_nights"], [start + timedelta(days=2)])
+
+    def test_available_and_occupancy_count_active_holds(self):
+        """Test nights under an active hold are reported as taken."""
+        held = create_property(name="Held Hotel", owner=self.user)
+        expired = create_property(name="Expired Hotel")
+        now = datetime.now(timezone.utc)
+        in_window = occupancy.get_origin() + timedelta(days=10)
+        for start in (in_window, date(2024, 7, 10)):
+            Hold.objects.create(
+                property=held,
+                user=self.user,
+                start_date=start + timedelta(days=1),
+                end_date=start + timedelta(days=2),
+                expires_at=now + timedelta(minutes=10),
+            )
+            Hold.objects.create(
+                property=expired,
+                user=self.user,
+                start_date=start,
+                end_date=start + timedelta(days=3),
+                expires_at=now - timedelta(minutes=1),
+            )
+        url = reverse("property:property-occupancy", args=[held.id])
+
+        for start in (in_window, date(2024, 7, 10)):
+            params = {"start": start, "end": start + timedelta(days=3)}
+            res = self.client.get(AVAILABLE_URL, params)
+            nights = self.client.get(url, params)
+
+            self.assertEqual([item["id"] for item in res.data], [expired.id])
+            self.assertFalse(nights.data["available"])
+            self.assertEqual(nights.data["booked_nights"], [start + timedelta(days=1)])
+
+    def test_batch_availability(self):
+        """Test checking many properties returns the first conflict of each."""
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="Test123"
+        )
+        free = create_property()
+        booked = create_property(owner=self.user)
+        hidden = create_property(owner=other)
+        for property, day in ((booked, 12), (booked, 9), (hidden, 10)):
+            Reservation.objects.create(
+                property=property,
+                user=other,
+                start_date=date(2024, 7, day),
+                end_date=date(2024, 7, day + 2),
+            )
+        first = Reservation.objects.get(property=booked, start_date=date(2024, 7, 9))
+        payload = {
+            "properties": [booked.id, hidden.id, free.id, 999999, booked.id],
+            "start": "2024-07-10",
+            "end": "2024-07-13",
+        }
+
+        with self.assertNumQueries(1):
+            res = self.client.post(AVAILABILITY_URL, payload, format="json")
+        with self.assertNumQueries(0):
+            cached = self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"],
+            [
+                {
+                    "property": booked.id,
+                    "available": False,
+                    "conflict": {
+                        "id": first.id,
+                        "start_date": "2024-07-09",
+                        "end_date": "2024-07-11",
+                    },
+                },
+                {"property": free.id, "available": True, "conflict": None},
+            ],
+        )
+        self.assertEqual(cached.data, res.data)
+
+    def test_batch_availability_hides_other_guests_reservations(self):
+        """Test another guest's conflict only reports its dates."""
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="Test123"
+        )
+        property = create_property()
+        Reservation.objects.create(
+            property=property,
+            user=other,
+            start_date=date(2024, 7, 9),
+            end_date=date(2024, 7, 11),
+        )
+        own = Reservation.objects.create(
+            property=property,
+            user=self.user,
+            start_date=date(2024, 7, 20),
+            end_date=date(2024, 7, 22),
+        )
+
+        res = self.client.post(
+            AVAILABILITY_URL,
+            {"properties": [property.id], "start": "2024-07-10", "end": "2024-07-12"},
+            format="json",
+        )
+        mine = self.client.post(
+            AVAILABILITY_URL,
+            {"properties": [property.id], "start": "2024-07-20", "end": "2024-07-21"},
+            format="json",
+        )
+
+        self.assertEqual(
+            res.data["results"][0]["conflict"],
+            {"start_date": "2024-07-09", "end_date": "2024-07-11"},
+        )
+        self.assertEqual(
+            mine.data["results"][0]["conflict"],
+            {"id": own.id, "start_date": "2024-07-20", "end_date": "2024-07-22"},
+        )
+
+    def test_batch_availability_invalidated_by_reservations(self):
+        """Test a reservation write invalidates the cached availability."""
+        property = create_property()
+        payload = {
+            "properties": [property.id],
+            "start": "2024-07-10",
+            "end": "2024-07-12",
+        }
+        self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        Reservation.objects.create(
+            property=property,
+            user=self.user,
+            start_date=date(2024, 7, 11),
+            end_date=date(2024, 7, 15),
+        )
+        res = self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        self.assertFalse(res.data["results"][0]["available"])
+
+    def test_batch_availability_reports_holds(self):
+        """Test an active hold blocks the stay until it is released."""
+        property = create_property()
+        Reservation.objects.create(
+            property=property,
+            user=self.user,
+            start_date=date(2024, 7, 1),
+            end_date=date(2024, 7, 3),
+        )
+        payload = {
+            "properties": [property.id],
+            "start": "2024-07-10",
+            "end": "2024-07-12",
+        }
+        self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        hold = Hold.objects.create(
+            property=property,
+            user=self.user,
+            start_date=date(2024, 7, 11),
+            end_date=date(2024, 7, 13),
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=10),
+        )
+        res = self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        result = res.data["results"][0]
+        self.assertFalse(result["available"])
+        self.assertEqual(result["conflict"]["start_date"], "2024-07-11")
+        self.assertEqual(
+            datetime.fromisoformat(result["conflict"]["held_until"]),
+            hold.expires_at,
+        )
+
+        hold.delete()
+        res = self.client.post(AVAILABILITY_URL, payload, format="json")
+
+        self.assertTrue(res.data["results"][0]["available"])
+
+    def test_batch_availability_invalid(self):
+        """Test empty, oversized and reversed batches are rejected."""
+        for payload in (
+            {"properties": [], "start": "2024-07-10", "end": "2024-07-12"},
+            {
+                "properties": list(range(1, 202)),
+                "start": "2024-07-10",
+                "end": "2024-07-12",
+            },
+            {"properties": [1], "start": "2024-07-12", "end": "2024-07-10"},
+        ):
+            res = self.client.post(AVAILABILITY_URL, payload, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_available_properties_invalid_range(self):
+        """Test availability search rejects an empty date range."""
+        res = self.client.get(
+            AVAILABLE_URL, {"start": "2024-07-12", "end": "2024-07-10"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", res.data)
+
+    def test_property_detail_nested_collections_paginated(self):
+        """Test detail embeds bounded pages of reservations and reviews."""
+        property = create_property(owner=self.user)
+        start = date(2024, 1, 1)
+        for i in range(NESTED_PAGE_SIZE + 5):
+            Reservation.objects.create(
+                property=property,
+                user=self.user,
+                start_date=start + timedelta(days=2 * i),
+                end_date=start + timedelta(days=2 * i + 1),
+            )
+            Review.objects.create(
+                property=property, user=self.user, rating=5, comment=f"{i}"
+            )
+
+        res = self.client.get(
+            detail_url(property.id), {"expand": "reservations,reviews"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        reservations = res.data["reservations"]
+        reviews = res.data["reviews"]
+        self.assertEqual(len(reservations["results"]), NESTED_PAGE_SIZE)
+        self.assertEqual(len(reviews["results"]), NESTED_PAGE_SIZE)
+        self.assertEqual(reservations["results"][0]["start_date"], str(start))
+        self.assertEqual(reviews["results"][0]["comment"], f"{NESTED_PAGE_SIZE + 4}")
+
+        res = self.client.get(reservations["next"])
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertIsNone(res.data["next"])
+
+        res = self.client.get(reviews["next"])
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertEqual(res.data["results"][-1]["comment"], "0")
+
+    def test_nested_reservations_limited_to_guest_or_owner(self):
+        """Test guests only see their own reservations, owners see all."""
+        owner = get_user_model().objects.create_user(
+            email="owner@example.com", password="Test123"
+        )
+        guest = get_user_model().objects.create_user(
+            email="guest@example.com", password="Test123"
+        )
+        owned = create_property(owner=owner)
+        public = create_property()
+        start = date(2024, 1, 1)
+        stays = {}
+        for property in (owned, public):
+            for offset, user in enumerate([self.user, guest]):
+                stays[property.id, user.id] = Reservation.objects.create(
+                    property=property,
+                    user=user,
+                    start_date=start + timedelta(days=2 * offset),
+                    end_date=start + timedelta(days=2 * offset + 1),
+                ).id
+
+        cases = [
+            (self.user, public, [stays[public.id, self.user.id]]),
+            (guest, public, [stays[public.id, guest.id]]),
+            (owner, owned, [stays[owned.id, self.user.id], stays[owned.id, guest.id]]),
+        ]
+        for user, property, expected in cases:
+            self.client.force_authenticate(user)
+
+            detail = self.client.get(
+                detail_url(property.id), {"expand": "reservations"}
+            )
+            listed = self.client.get(
+                reverse("property:property-reservations", args=[property.id])
+            )
+
+            nested = detail.data["reservations"]["results"]
+            self.assertEqual([r["id"] for r in nested], expected)
+            self.assertEqual([r["id"] for r in listed.data], expected)
+
+    def test_property_detail_constant_queries(self):
+        """Test detail query count does not grow with nested collections."""
+        property = create_property(owner=self.user)
+        start = date(2024, 1, 1)
+        for i in range(3 * NESTED_PAGE_SIZE):
+            Reservation.objects.create(
+                property=property,
+                user=self.user,
+                start_date=start + timedelta(days=2 * i),
+                end_date=start + timedelta(days=2 * i + 1),
+            )
+            Review.objects.create(
+                property=property, user=self.user, rating=4, comment="ok"
+            )
+
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                detail_url(property.id), {"expand": "reservations,reviews"}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(detail_url(property.id))
+
+        self.assertNotIn("reservations", res.data)
+        self.assertNotIn("reviews", res.data)
+
+    def test_sort_properties_by_rating(self):
+        """Test sorting properties by average rating."""
+        low = create_property(rating_avg=Decimal("2.50"), rating_count=2)
+        high = create_property(rating_avg=Decimal("4.75"), rating_count=4)
+        unrated = create_property()
+
+        res = self.client.get(PROPERTY_URL, {"ordering": "-rating_avg"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.data], [high.id, low.id, unrated.id]
+        )
+        self.assertEqual(res.data[0]["rating_avg"], "4.75")
+        self.assertEqual(res.data[0]["rating_count"], 4)
+
+    @override_settings(PROPERTY_CACHE_STATS=True)
+    def test_list_served_from_cache_until_write(self):
+        """Test list responses are cached and invalidated by property writes."""
+        create_property(owner=self.user, name="first")
+        stats = cache.get_stats()
+
+        res1 = self.client.get(PROPERTY_URL)
+        res2 = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res1["X-Cache"], "MISS")
+        self.assertEqual(res2["X-Cache"], "HIT")
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(cache.get_stats()["hits"], stats["hits"] + 1)
+        self.assertEqual(cache.get_stats()["misses"], stats["misses"] + 1)
+
+        create_property(owner=self.user, name="second")
+        res3 = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res3["X-Cache"], "MISS")
+        self.assertEqual(len(res3.data), 2)
+
+    def test_cache_stats_disabled_by_default(self):
+        """Test hits and misses are not counted unless enabled."""
+        create_property(owner=self.user)
+        stats = cache.get_stats()
+
+        self.client.get(PROPERTY_URL)
+        self.client.get(PROPERTY_URL)
+
+        self.assertEqual(cache.get_stats(), stats)
+
+    def test_detail_cache_invalidated_by_related_writes(self):
+        """Test detail responses are invalidated by reservations and reviews."""
+        property = create_property(owner=self.user)
+        url = detail_url(property.id) + "?expand=reservations,reviews"
+        self.client.get(url)
+
+        Reservation.objects.create(
+            property=property,
+            user=self.user,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 3),
+        )
+        res = self.client.get(url)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["reservations"]["results"]), 1)
+
+        Review.objects.create(property=property, user=self.user, rating=5)
+        res = self.client.get(url)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["reviews"]["results"]), 1)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+    def test_cache_keyed_by_user(self):
+        """Test cached responses are not shared between users."""
+        create_property(owner=self.user)
+        self.client.get(PROPERTY_URL)
+        another_user = get_user_model().objects.create_user(
+            email="another@example.com",
+            password="Test123",
+        )
+        self.client.force_authenticate(another_user)
+
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data, [])
+
+    def test_conditional_get_not_modified(self):
+        """Test a matching If-None-Match returns 304 until a write."""
+        property = create_property(owner=self.user)
+        res = self.client.get(detail_url(property.id))
+        etag = res["ETag"]
+
+        res = self.client.get(detail_url(property.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Review.objects.create(property=property, user=self.user, rating=3)
+        res = self.client.get(detail_url(property.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_export_ndjson_honors_filters_and_visibility(self):
+        """Test the export streams filtered rows visible to the user."""
+        create_property(owner=self.user, name="Cheap", price=Decimal("1.00"))
+        expensive = create_property(name="Expensive", price=Decimal("9.00"))
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="Test123"
+        )
+        create_property(owner=other, price=Decimal("9.00"))
+
+        res = self.client.get(EXPORT_URL, {"price_min": "5"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson; charset=utf-8")
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["id"] for row in rows], [expensive.id])
+        self.assertEqual(rows[0]["price"], "9.00")
+
+    def test_export_csv(self):
+        """Test the export can be streamed as CSV."""
+        property = create_property(owner=self.user)
+
+        res = self.client.get(EXPORT_URL, {"format": "csv"})
+
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        content = b"".join(res.streaming_content).decode()
+        header, row = list(csv.reader(content.splitlines()))
+        self.assertEqual(header[:3], ["id", "name", "location"])
+        self.assertEqual(row[:2], [str(property.id), property.name])
+
+    def test_sparse_fields_on_list(self):
+        """Test ?fields= limits the payload and the selected columns."""
+        create_property(owner=self.user, name="Hotel", price=Decimal("12.50"))
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PROPERTY_URL, {"fields": "id,name,price"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(res.data[0]), ["id", "name", "price"])
+        self.assertEqual(res.data[0]["price"], "12.50")
+        select = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("description", select)
+        self.assertNotIn("rating_1_count", select)
+
+    def test_sparse_fields_with_expand(self):
+        """Test expanded collections are kept alongside the sparse fields."""
+        property = create_property(owner=self.user)
+        Review.objects.create(property=property, user=self.user, rating=5)
+
+        res = self.client.get(
+            detail_url(property.id), {"fields": "id", "expand": "reviews"}
+        )
+
+        self.assertEqual(set(res.data), {"id", "reviews"})
+        self.assertEqual(len(res.data["reviews"]["results"]), 1)
+
+    def test_sparse_fields_computed_field(self):
+        """Test fields computed from several columns are still served."""
+        create_property(owner=self.user, rating_5_count=2)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PROPERTY_URL, {"fields": "id,rating_histogram"})
+
+        self.assertEqual(res.data[0]["rating_histogram"][5], 2)
+
+    def test_list_values_path_matches_serializer(self):
+        """Test the values() list path keeps the serializer output format."""
+        owner = get_user_model().objects.create_user(
+            email="owner@example.com", password="Test123"
+        )
+        create_property(owner=self.user, price=Decimal("1.5"))
+        create_property(
+            price=Decimal("12345678.9"),
+            rating_avg=Decimal("4.67"),
+            rating_count=3,
+            rating_4_count=1,
+            rating_5_count=2,
+        )
+        create_property(owner=owner)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PROPERTY_URL, {"ordering": "price"})
+        properties = Property.objects.visible_to(self.user).order_by("price", "-id")
+        serializer = PropertySerializer(properties, many=True)
+
+        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data[0]["price"], "1.50")
+
+        res = self.client.get(PROPERTY_URL, {"ordering": "price", "page_size": 1})
+        self.assertEqual(res.data["results"], serializer.data[:1])
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"], serializer.data[1:2])
+
+
+class RendererTests(TestCase):
+    """Test the fast JSON and MessagePack renderers and parsers."""
+
+    data = {
+        "price": Decimal("12.50"),
+        "start_date": date(2024, 1, 2),
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=timezone.utc),
+        "rating_histogram": {1: 0, 5: 2},
+        "name": "Chata \u017c\u00f3\u0142ta \u2028\u2029",
+        "tags": [None, True, 1.5],
+    }
+
+    def test_fast_json_matches_json_renderer(self):
+        """Test FastJSONRenderer output is byte-identical to JSONRenderer."""
+        expected = JSONRenderer().render(self.data)
+
+        self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+        self.assertIn(b'"2024-01-02T03:04:05.600000Z"', expected)
+        self.assertIn(b"\\u2028", expected)
+
+    def test_fast_json_falls_back_without_orjson(self):
+        """Test FastJSONRenderer renders through JSONRenderer without orjson."""
+        expected = JSONRenderer().render(self.data)
+
+        with patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+
+    def test_fast_json_indent(self):
+        """Test indented output is left to JSONRenderer."""
+        context = {"indent": 2}
+        expected = JSONRenderer().render(self.data, renderer_context=context)
+
+        res = renderers.FastJSONRenderer().render(self.data, renderer_context=context)
+
+        self.assertEqual(res, expected)
+
+    def test_fast_json_parser(self):
+        """Test FastJSONParser reads JSON and rejects malformed bodies."""
+        parser = renderers.FastJSONParser()
+
+        data = parser.parse(io.BytesIO(b'{"name": "\xc5\xbc", "price": "1.50"}'))
+
+        self.assertEqual(data, {"name": "\u017c", "price": "1.50"})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"name": '))
+
+    def test_fast_json_parser_falls_back_without_orjson(self):
+        """Test FastJSONParser parses through JSONParser without orjson."""
+        parser = renderers.FastJSONParser()
+
+        with patch.object(renderers, "orjson", None):
+            data = parser.parse(io.BytesIO(b'{"name": "\xc5\xbc", "price": "1.50"}'))
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(b'{"name": '))
+
+        self.assertEqual(data, {"name": "\u017c", "price": "1.50"})
+
+    def test_api_json_round_trip(self):
+        """Test API requests and responses go through the fast JSON classes."""
+        user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = {"name": "\u017c", "location": "loc", "price": "12.50"}
+
+        res = client.post(PROPERTY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(res.content)["price"], "12.50")
+        self.assertEqual(res.content, JSONRenderer().render(res.data))
+
+    @skipUnless(renderers.msgpack, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        """Test MessagePack rendering and parsing."""
+        content = renderers.MessagePackRenderer().render(self.data)
+        data = renderers.MessagePackParser().parse(io.BytesIO(content))
+
+        self.assertEqual(data["price"], 12.5)
+        self.assertEqual(data["created_at"], "2024-01-02T03:04:05.600000Z")
+        self.assertEqual(data["rating_histogram"], {1: 0, 5: 2})
@@ -4,6 +4,8 @@ Tests for property model.
 
 from decimal import Decimal
 
+from django.db import connection, transaction
+from django.db.models import Count
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -27,3 +29,65 @@ class PropertyModelTest(TestCase):
         )
 
         self.assertEqual(str(property), property.name)
+
+
+class PropertyVisibilityQueryTest(TestCase):
+    """Test the query plan of the property visibility rule."""
+
+    def setUp(self):
+        self.users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"owner{i}@example.com") for i in range(50)
+        )
+        properties = [
+            models.Property(
+                name=f"Hotel {i}",
+                location="Warsaw",
+                price=Decimal("10.00"),
+                owner=self.users[i % len(self.users)] if i % 100 else None,
+            )
+            for i in range(10000)
+        ]
+        models.Property.objects.bulk_create(properties, batch_size=1000)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE property_property")
+
+    def test_visible_to_returns_owned_and_public(self):
+        """Test visible_to includes owned and unassigned properties only."""
+        user = self.users[1]
+
+        visible = models.Property.objects.visible_to(user)
+
+        expected = models.Property.objects.filter(owner=user).count() + (
+            models.Property.objects.filter(owner__isnull=True).count()
+        )
+        self.assertEqual(visible.count(), expected)
+        self.assertFalse(visible.exclude(owner=user).exclude(owner=None).exists())
+
+    def test_visible_to_plan_uses_indexes(self):
+        """Test the visibility query does not fall back to a sequential scan."""
+        queryset = models.Property.objects.visible_to(self.users[1]).order_by("-id")
+
+        self.assertNotIn("Seq Scan", queryset.explain())
+        self.assertNotIn("Seq Scan", queryset[:20].explain())
+
+    def test_visible_to_supports_aggregates_and_locking(self):
+        """Test the visible queryset composes with GROUP BY and FOR UPDATE."""
+        visible = models.Property.objects.visible_to(self.users[1])
+
+        counts = visible.annotate(reviews=Count("review")).order_by("-id")[:5]
+        with transaction.atomic():
+            locked = list(visible.select_for_update().order_by("-id")[:5])
+
+        self.assertEqual([p.reviews for p in counts], [0] * 5)
+        self.assertEqual([p.id for p in locked], [p.id for p in counts])
+
+    def test_visible_to_update_keeps_visibility(self):
+        """Test updating a visible queryset leaves hidden properties alone."""
+        user = self.users[1]
+
+        models.Property.objects.visible_to(user).update(location="Gdansk")
+
+        hidden = models.Property.objects.exclude(owner=user).exclude(owner=None)
+        self.assertFalse(hidden.filter(location="Gdansk").exists())
+        visible = models.Property.objects.visible_to(user)
+        self.assertFalse(visible.exclude(location="Gdansk").exists())
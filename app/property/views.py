@@ -3,42 +3,189 @@ Views for property API.
 """
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from django_filters.rest_framework import DjangoFilterBackend
 
+from config.conditional import ConditionalGetMixin
+from config.encoders import FastListMixin
+from config.export import ExportMixin
+from config.fieldsets import SparseFieldsMixin
+from config.pagination import KeysetPagination
 from property import models, serializers
+from property.availability import get_conflicts
+from property.cache import CachedResponseMixin, get_version
 from property.filters import PropertyFilter
+from reservation import occupancy
+from reservation.models import Reservation
+from reservation.serializers import ReservationSerializer
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsMixin,
+    ExportMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     """View for manage property APIs."""
 
     serializer_class = serializers.PropertyDetailSerializer
     queryset = models.Property.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = PropertyFilter
-    ordering_fields = ["name", "location", "price"]
+    ordering_fields = ["name", "location", "price", "rating_avg"]
+    pagination_class = KeysetPagination
+    export_fields = (
+        "id",
+        "name",
+        "location",
+        "price",
+        "description",
+        "owner",
+        "rating_avg",
+        "rating_count",
+    )
 
     def get_queryset(self):
         """Retrieve properties for authenticated user."""
-        user = self.request.user
-        return (
-            models.Property.objects.filter(owner=user)
-            | models.Property.objects.filter(owner__isnull=True)
-        ).order_by("-id")
+        queryset = models.Property.objects.visible_to(self.request.user)
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                *serializers.get_nested_prefetches(
+                    self.request.user, self.get_requested_expand()
+                )
+            )
+
+        return queryset.order_by("-id")
+
+    def filter_queryset(self, queryset):
+        """Filter and order the queryset, breaking ties on the pk."""
+        queryset = super().filter_queryset(queryset)
+        # Rows with equal sort keys have no natural order; use the same
+        # tie-breaker as the pagination cursor.
+        return queryset.order_by(*self.paginator.get_ordering(queryset))
+
+    def get_conditional_state(self, queryset):
+        """
+        Derive validators from the response cache versions.
+
+        The versions move on every write to a property, its reservations or
+        its reviews, so no aggregate over the catalog is needed.
+        """
+        property_id = self.kwargs["pk"] if self.action == "retrieve" else None
+        parts = [
+            self.request.user.pk,
+            self.request.get_full_path(),
+            get_version(property_id),
+        ]
+        return parts, None
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
-        if self.action == "list":
+        if self.action in ("list", "available"):
             return serializers.PropertySerializer
+        if self.action == "availability":
+            return serializers.AvailabilityBatchSerializer
 
         return self.serializer_class
 
     def perform_create(self, serializer):
         """Create a new property."""
         serializer.save()
+
+    @action(detail=False, methods=["get"])
+    def available(self, request):
+        """List properties with no reservation or active hold in the date range."""
+        query = serializers.AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        booked = occupancy.get_booked_filter(
+            query.validated_data["start"], query.validated_data["end"]
+        )
+        queryset = self.filter_queryset(self.get_queryset()).filter(~booked)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["post"])
+    def availability(self, request):
+        """Report which of the given properties are free for the stay."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data["start"]
+        end = serializer.validated_data["end"]
+
+        conflicts = get_conflicts(
+            request.user, serializer.validated_data["properties"], start, end
+        )
+        results = [
+            {
+                "property": property_id,
+                "available": conflict is None,
+                "conflict": conflict,
+            }
+            for property_id, conflict in conflicts.items()
+        ]
+        return Response({"start": start, "end": end, "results": results})
+
+    @action(detail=True, methods=["get"])
+    def occupancy(self, request, pk=None):
+        """Report whether the property is free and which nights are booked."""
+        query = serializers.AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start = query.validated_data["start"]
+        end = query.validated_data["end"]
+        property = self.get_object()
+
+        nights = occupancy.get_booked_nights(property.pk, start, end)
+        return Response(
+            {
+                "property": property.pk,
+                "start": start,
+                "end": end,
+                "available": not nights,
+                "booked_nights": nights,
+            }
+        )
+
+    @action(detail=True, methods=["get"])
+    def reservations(self, request, pk=None):
+        """
+        List reservations of the property, ordered by start date.
+
+        Owners see every reservation, other users only their own.
+        """
+        property = self.get_object()
+        queryset = (
+            Reservation.objects.visible_to(request.user)
+            .filter(property=property)
+            .order_by(*serializers.RESERVATION_ORDERING)
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = ReservationSerializer(
+                page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_paginated_response(serializer.data)
+
+        serializer = ReservationSerializer(
+            queryset, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
@@ -0,0 +1,112 @@
+"""
+Batched reservation creation.
+
+A batch is checked for overlaps with one sort-and-sweep over
+``(property, start_date)``: within a property, a stay conflicts when it
+starts before the previous accepted stay ends or when it overlaps one of
+the booked stays fetched for the whole batch in a single query.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import groupby
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from property.cache import invalidate
+from reservation.holds import raise_conflict
+from reservation.models import Hold, Reservation
+
+
+def get_booked(reservations):
+    """
+    Return booked ``(start, end)`` stays per property that may overlap.
+
+    Active holds block their nights like reservations do.
+    """
+    booked = defaultdict(list)
+    if not reservations:
+        return booked
+
+    lookups = {
+        "property_id__in": {r.property_id for r in reservations},
+        "start_date__lt": max(r.end_date for r in reservations),
+        "end_date__gt": min(r.start_date for r in reservations),
+    }
+    fields = ("property_id", "start_date", "end_date")
+    stays = (
+        Reservation.objects.filter(**lookups)
+        .filter(start_date__lt=F("end_date"))
+        .values_list(*fields)
+    )
+    holds = Hold.objects.active().filter(**lookups).values_list(*fields)
+    rows = stays.union(holds, all=True).order_by("property_id", "start_date")
+    for property_id, start_date, end_date in rows:
+        booked[property_id].append((start_date, end_date))
+    return booked
+
+
+def sweep(reservations, booked):
+    """
+    Return the indexes of reservations that cannot be booked.
+
+    Of two overlapping reservations in the batch the one starting first is
+    kept. Empty stays (``start_date == end_date``) never conflict.
+    """
+    conflicts = set()
+    ordered = sorted(
+        (
+            (reservation.property_id, reservation.start_date, index, reservation)
+            for index, reservation in enumerate(reservations)
+            if reservation.start_date < reservation.end_date
+        ),
+        key=lambda item: item[:3],
+    )
+    for property_id, group in groupby(ordered, key=lambda item: item[0]):
+        stays = booked.get(property_id, [])
+        starts = [start for start, end in stays]
+        last_end = None
+        for _, start_date, index, reservation in group:
+            # Booked stays never overlap, so only the last one starting
+            # before this stay ends can reach into it.
+            position = bisect_left(starts, reservation.end_date) - 1
+            if (last_end is not None and start_date < last_end) or (
+                position >= 0 and stays[position][1] > start_date
+            ):
+                conflicts.add(index)
+                continue
+            last_end = reservation.end_date
+    return conflicts
+
+
+def create_reservations(reservations):
+    """
+    Insert every reservation that does not conflict and return the indexes
+    of the ones that do.
+
+    Raises ``Conflict`` when a concurrent booking wins the race between the
+    check and the insert; the batch is rolled back and can be retried.
+    """
+    try:
+        with transaction.atomic():
+            conflicts = sweep(reservations, get_booked(reservations))
+            # Rows are inserted by property so concurrent batches take the
+            # per-property hold locks in the same order.
+            Reservation.objects.bulk_create(
+                sorted(
+                    (
+                        r
+                        for index, r in enumerate(reservations)
+                        if index not in conflicts
+                    ),
+                    key=lambda r: r.property_id,
+                )
+            )
+    except IntegrityError as error:
+        raise_conflict(error)
+
+    # bulk_create sends no post_save signals.
+    for property_id in {r.property_id for r in reservations}:
+        invalidate(property_id, include_global=False)
+    return conflicts
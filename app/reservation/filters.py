@@ -0,0 +1,69 @@
+"""
+Filters for reservation API.
+"""
+
+from django import forms
+from django.utils import timezone
+from django_filters import rest_framework as filters
+
+from reservation.models import Reservation, ReservationTombstone
+
+
+class SyncTokenFilter(filters.NumberFilter):
+    """Filter taking the ``X-Sync-Token`` of an earlier sync."""
+
+    field_class = forms.IntegerField
+
+
+class ReservationFilter(filters.FilterSet):
+    """Filter class for reservation queryset."""
+
+    when = filters.ChoiceFilter(
+        choices=[("upcoming", "Upcoming"), ("past", "Past")],
+        method="filter_when",
+    )
+
+    class Meta:
+        model = Reservation
+        fields = ["when"]
+
+    def filter_when(self, queryset, name, value):
+        """
+        Keep stays not checked out yet, or finished ones latest first.
+
+        A stay in progress is upcoming until its check-out day. Upcoming
+        stays are found through the ``(user, end_date)`` index and past ones
+        by reading the ``(user, start_date, id)`` index backwards.
+        """
+        today = timezone.now().date()
+        if value == "upcoming":
+            return queryset.filter(end_date__gt=today)
+        return queryset.filter(end_date__lte=today).order_by("-start_date", "-id")
+
+
+class OwnerReservationFilter(filters.FilterSet):
+    """Filter class for reservations on the owner's properties."""
+
+    updated_since = SyncTokenFilter(method="filter_updated_since", min_value=0)
+
+    class Meta:
+        model = Reservation
+        fields = ["property", "updated_since"]
+
+    def filter_updated_since(self, queryset, name, value):
+        """Keep reservations changed since the sync token, oldest change first."""
+        return queryset.filter(change_id__gte=value).order_by("change_id", "id")
+
+
+class ReservationTombstoneFilter(filters.FilterSet):
+    """Filter class for reservations deleted from the owner's properties."""
+
+    updated_since = SyncTokenFilter(method="filter_updated_since", min_value=0)
+
+    class Meta:
+        model = ReservationTombstone
+        fields = ["property", "updated_since"]
+
+    def filter_updated_since(self, queryset, name, value):
+        """Keep reservations deleted since the sync token."""
+        return queryset.filter(change_id__gte=value)
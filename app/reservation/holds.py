@@ -0,0 +1,117 @@
+"""
+Temporary holds on the nights of a property.
+
+A hold blocks its nights for ``RESERVATION_HOLD_TTL`` seconds while the
+guest pays, then either turns into a reservation or expires. Holds never
+overlap each other (exclusion constraint) nor a reservation (row triggers):
+both triggers take the same per-property advisory lock before looking at
+the other table, so a hold and a reservation racing for the same nights
+are serialized and the second one fails with a constraint violation.
+Expired holds stop blocking immediately and are deleted in batches by
+``sweep_expired``, from the ``sweep_holds`` command.
+"""
+
+from config.exceptions import Conflict, is_constraint_violation
+from reservation.models import (
+    HELD_CONSTRAINT,
+    HELD_MESSAGE,
+    HOLD_BOOKED_CONSTRAINT,
+    HOLD_BOOKED_MESSAGE,
+    HOLD_NO_OVERLAP_CONSTRAINT,
+    NO_OVERLAP_CONSTRAINT,
+    NO_OVERLAP_MESSAGE,
+    Hold,
+)
+
+TABLE = "reservation_hold"
+LOCK_SQL = (
+    "PERFORM pg_advisory_xact_lock("
+    "hashtext('reservation_hold'), hashtext(NEW.property_id::text))"
+)
+OVERLAPS_SQL = (
+    "daterange(t.start_date, t.end_date, '[)') "
+    "&& daterange(NEW.start_date, NEW.end_date, '[)')"
+)
+
+# Trigger name, guarded table, function body check and raised constraint.
+CHECKS = {
+    f"{TABLE}_check_reservation": (
+        "reservation_reservation",
+        f"SELECT 1 FROM {TABLE} t WHERE t.property_id = NEW.property_id "
+        f"AND t.expires_at > clock_timestamp() AND {OVERLAPS_SQL}",
+        HELD_CONSTRAINT,
+        HELD_MESSAGE,
+    ),
+    f"{TABLE}_check_hold": (
+        TABLE,
+        "SELECT 1 FROM reservation_reservation t "
+        f"WHERE t.property_id = NEW.property_id AND {OVERLAPS_SQL}",
+        HOLD_BOOKED_CONSTRAINT,
+        HOLD_BOOKED_MESSAGE,
+    ),
+}
+
+CONFLICT_MESSAGES = {
+    NO_OVERLAP_CONSTRAINT: NO_OVERLAP_MESSAGE,
+    HOLD_NO_OVERLAP_CONSTRAINT: HELD_MESSAGE,
+    HELD_CONSTRAINT: HELD_MESSAGE,
+    HOLD_BOOKED_CONSTRAINT: HOLD_BOOKED_MESSAGE,
+}
+
+
+def raise_conflict(error):
+    """Raise ``Conflict`` for an IntegrityError from an overlap, else re-raise it."""
+    for constraint, message in CONFLICT_MESSAGES.items():
+        if is_constraint_violation(error, constraint):
+            raise Conflict(message)
+    raise error
+
+
+def get_create_sql():
+    """Return the statements installing the hold functions and triggers."""
+    statements = []
+    for name, (table, check, constraint, message) in CHECKS.items():
+        statements.append(
+            f"""
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    {LOCK_SQL};
+    IF EXISTS ({check}) THEN
+        RAISE EXCEPTION USING
+            ERRCODE = 'exclusion_violation',
+            CONSTRAINT = '{constraint}',
+            MESSAGE = '{message}';
+    END IF;
+    RETURN NEW;
+END
+$$;
+"""
+        )
+        statements.append(
+            f"CREATE TRIGGER {name} "
+            f"BEFORE INSERT OR UPDATE OF property_id, start_date, end_date "
+            f"ON {table} FOR EACH ROW EXECUTE FUNCTION {name}()"
+        )
+    return statements
+
+
+def get_drop_sql():
+    """Return the statements removing the hold functions and triggers."""
+    statements = []
+    for name, (table, *_) in CHECKS.items():
+        statements.append(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        statements.append(f"DROP FUNCTION IF EXISTS {name}()")
+    return statements
+
+
+def sweep_expired(batch_size=1000):
+    """Delete expired holds in batches and return how many were deleted."""
+    expired = Hold.objects.expired().order_by("expires_at")
+    deleted = 0
+    while True:
+        batch = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+        deleted += Hold.objects.filter(pk__in=batch).delete()[0]
+    return deleted
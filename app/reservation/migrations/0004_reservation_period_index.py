@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:02
+
+import django.contrib.postgres.indexes
+import reservation.models
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0006_property_trigram_indexes"),
+        ("reservation", "0003_rename_property_obj_reservation_property"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.F("property"),
+                reservation.models.DateRangeFunc("start_date", "end_date"),
+                name="reservation_property_period_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:03
+
+import django.contrib.postgres.constraints
+import reservation.models
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0006_property_trigram_indexes"),
+        ("reservation", "0004_reservation_period_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reservation",
+            name="reservation_property_period_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="reservation",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=[
+                    ("property", "="),
+                    (reservation.models.DateRangeFunc("start_date", "end_date"), "&&"),
+                ],
+                name="reservation_no_overlap",
+                violation_error_message="This property is already booked for the selected dates.",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-17 04:03
+
+import django.db.models.deletion
+import reservation.models
+import reservation.occupancy
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0006_reservation_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Occupancy",
+            fields=[
+                (
+                    "property",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="occupancy",
+                        serialize=False,
+                        to="property.property",
+                    ),
+                ),
+                ("origin", models.DateField()),
+                ("bits", reservation.models.BitStringField()),
+            ],
+        ),
+        migrations.RunSQL(
+            reservation.occupancy.get_create_sql(),
+            reservation.occupancy.get_drop_sql(),
+        ),
+        migrations.RunSQL(
+            reservation.occupancy.get_backfill_sql(), migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.6 on 2026-10-17 04:15
+
+import django.contrib.postgres.constraints
+import django.db.models.deletion
+import reservation.holds
+import reservation.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0007_occupancy"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Hold",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="holds",
+                        to="property.property",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="hold",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=[
+                    ("property", "="),
+                    (reservation.models.DateRangeFunc("start_date", "end_date"), "&&"),
+                ],
+                name="reservation_hold_no_overlap",
+                violation_error_message="This property is held for the selected dates.",
+            ),
+        ),
+        migrations.RunSQL(
+            reservation.holds.get_create_sql(), reservation.holds.get_drop_sql()
+        ),
+    ]
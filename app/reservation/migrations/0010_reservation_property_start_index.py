@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-17 04:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0009_reservation_user_start_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["property", "start_date", "id"],
+                name="reservation_property_start_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="reservation",
+            name="property",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="property.property",
+            ),
+        ),
+    ]
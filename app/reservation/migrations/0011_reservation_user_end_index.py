@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-17 05:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0010_reservation_property_start_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "end_date"], name="reservation_user_end_idx"
+            ),
+        ),
+    ]
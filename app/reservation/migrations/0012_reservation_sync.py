@@ -0,0 +1,60 @@
+# Generated by Django 5.0.6 on 2026-10-17 05:06
+
+import django.db.models.deletion
+import reservation.sync
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0008_property_updated_at"),
+        ("reservation", "0011_reservation_user_end_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationTombstone",
+            fields=[
+                (
+                    "reservation_id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("change_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="reservation",
+            name="change_id",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["change_id", "id"], name="reservation_change_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservationtombstone",
+            name="property",
+            field=models.ForeignKey(
+                db_constraint=False,
+                db_index=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="property.property",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservationtombstone",
+            index=models.Index(
+                fields=["change_id", "reservation_id"], name="reservation_tombstone_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            reservation.sync.get_create_sql(), reservation.sync.get_drop_sql()
+        ),
+    ]
@@ -2,19 +2,194 @@
 Reservations models.
 """
 
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
 from django.db import models
+from django.db.backends.postgresql.psycopg_any import DateRange
 from django.conf import settings
+from django.utils import timezone
 
 from property.models import Property
 
+NO_OVERLAP_CONSTRAINT = "reservation_no_overlap"
+NO_OVERLAP_MESSAGE = "This property is already booked for the selected dates."
+HOLD_NO_OVERLAP_CONSTRAINT = "reservation_hold_no_overlap"
+HELD_CONSTRAINT = "reservation_held"
+HELD_MESSAGE = "This property is held for the selected dates."
+HOLD_BOOKED_CONSTRAINT = "reservation_hold_booked"
+HOLD_BOOKED_MESSAGE = NO_OVERLAP_MESSAGE
+
+
+class DateRangeFunc(models.Func):
+    """Half-open ``[start, end)`` daterange built from two date columns."""
+
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(start, end, models.Value("[)"), **extra)
+
+
+class BitStringField(models.Field):
+    """PostgreSQL ``bit varying`` column, read and written as a string of 0/1."""
+
+    def db_type(self, connection):
+        return "bit varying"
+
+
+class ReservationQuerySet(models.QuerySet):
+    """Queryset for reservations."""
+
+    def overlapping(self, start_date, end_date):
+        """Filter to reservations overlapping the ``[start_date, end_date)`` stay."""
+        return self.alias(
+            period=DateRangeFunc("start_date", "end_date"),
+        ).filter(period__overlap=DateRange(start_date, end_date, "[)"))
+
+    def visible_to(self, user):
+        """Filter to reservations the user made or received as the owner."""
+        return self.filter(models.Q(user=user) | models.Q(property__owner=user))
+
 
 class Reservation(models.Model):
     """Reservation object."""
 
-    property = models.ForeignKey(Property, on_delete=models.CASCADE)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Covered by the (property, start_date, id) and (user, start_date, id)
+    # indexes.
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
+    )
     start_date = models.DateField()
     end_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+    # Id of the last transaction that wrote the row, set by a trigger (see
+    # ``reservation.sync``).
+    change_id = models.BigIntegerField(default=0, editable=False)
+
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["change_id", "id"], name="reservation_change_idx"),
+            models.Index(
+                fields=["user", "start_date", "id"], name="reservation_user_start_idx"
+            ),
+            models.Index(fields=["user", "end_date"], name="reservation_user_end_idx"),
+            models.Index(
+                fields=["property", "start_date", "id"],
+                name="reservation_property_start_idx",
+            ),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=NO_OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("property", RangeOperators.EQUAL),
+                    (DateRangeFunc("start_date", "end_date"), RangeOperators.OVERLAPS),
+                ],
+                violation_error_message=NO_OVERLAP_MESSAGE,
+            ),
+        ]
 
     def __str__(self):
         return f"Reservation by {self.user} for {self.property}"
+
+
+class ReservationTombstone(models.Model):
+    """
+    Trace of a deleted reservation for the owner sync feed.
+
+    Rows are written by a database trigger (see ``reservation.sync``).
+    """
+
+    reservation_id = models.BigIntegerField(primary_key=True)
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        db_constraint=False,
+        db_index=False,
+    )
+    change_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["change_id", "reservation_id"],
+                name="reservation_tombstone_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deleted reservation {self.reservation_id}"
+
+
+class Occupancy(models.Model):
+    """
+    One bit per night of a property, set when the night is booked.
+
+    Bit ``i`` (counted from the left) is the night starting ``origin + i``
+    days. Rows are maintained by database triggers (see
+    ``reservation.occupancy``) and dropped when their property is deleted.
+    """
+
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        related_name="occupancy",
+        db_constraint=False,
+    )
+    origin = models.DateField()
+    bits = BitStringField()
+
+    def __str__(self):
+        return f"Occupancy of {self.property_id} from {self.origin}"
+
+
+class HoldQuerySet(ReservationQuerySet):
+    """Queryset for holds."""
+
+    def active(self):
+        """Filter to holds that still block their nights."""
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        """Filter to holds past their expiry, waiting to be swept."""
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class Hold(models.Model):
+    """
+    Temporary claim on the nights of a property while the guest pays.
+
+    Only active holds block bookings; see ``reservation.holds``.
+    """
+
+    property = models.ForeignKey(
+        Property, on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = HoldQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            ExclusionConstraint(
+                name=HOLD_NO_OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("property", RangeOperators.EQUAL),
+                    (DateRangeFunc("start_date", "end_date"), RangeOperators.OVERLAPS),
+                ],
+                violation_error_message=HELD_MESSAGE,
+            ),
+        ]
+
+    def __str__(self):
+        return f"Hold by {self.user} for {self.property}"
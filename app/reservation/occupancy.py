@@ -0,0 +1,403 @@
+"""
+Per-property occupancy bitmaps.
+
+Each property has one ``Occupancy`` row covering ``WINDOW_DAYS`` nights from
+the first day of the current month (UTC). Statement-level triggers set and
+clear the nights of inserted, updated and deleted reservations, and rebuild
+a row from the reservations when it is missing or its window has rolled
+over. Availability then becomes a bitwise AND with the mask of the
+requested nights; stays reaching outside the window fall back to the range
+query over reservations. Active holds are not part of the bitmaps and are
+checked with a range query of their own.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, F, Func, IntegerField, OuterRef, Q, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from property.cache import get_versions
+from reservation.models import BitStringField, Hold, Occupancy, Reservation
+from user.authentication import LRUCache
+
+WINDOW_DAYS = 768
+
+TABLE = "reservation_occupancy"
+ORIGIN_SQL = "date_trunc('month', now() AT TIME ZONE 'UTC')::date"
+
+local_bitmaps = LRUCache(
+    settings.OCCUPANCY_CACHE_SIZE, settings.OCCUPANCY_CACHE_TIMEOUT
+)
+
+
+def get_origin():
+    """Return the first night of the current window."""
+    return timezone.now().date().replace(day=1)
+
+
+def get_mask(origin, start_date, end_date):
+    """
+    Return the bitmask of the nights in ``[start_date, end_date)``.
+
+    Returns None when the stay is not inside the window starting at origin.
+    """
+    first = (start_date - origin).days
+    last = (end_date - origin).days
+    if first < 0 or last > WINDOW_DAYS:
+        return None
+    return ((1 << max(last - first, 0)) - 1) << first
+
+
+def parse_bits(bits):
+    """Return the bit string of a row as an int with night ``i`` at bit ``i``."""
+    return int(bits[::-1], 2)
+
+
+def format_bits(value):
+    """Return the bit string of an int bitmap."""
+    return format(value, f"0{WINDOW_DAYS}b")[::-1]
+
+
+def get_nights(bitmap, origin, start_date, end_date):
+    """Return the booked nights of a bitmap in ``[start_date, end_date)``."""
+    first = (start_date - origin).days
+    return [
+        origin + timedelta(days=night)
+        for night in range(first, (end_date - origin).days)
+        if bitmap >> night & 1
+    ]
+
+
+def refresh(property_ids):
+    """Build missing rows and roll stale ones over to the current window."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {TABLE}_refresh(%s::bigint[])", [sorted(set(property_ids))]
+        )
+
+
+def get_bitmaps(property_ids, origin):
+    """
+    Return ``{property_id: bitmap}`` for the window starting at origin.
+
+    Bitmaps are mirrored in a per-process LRU and checked against the
+    property cache versions, which every reservation write bumps, so only
+    missing or outdated entries are read from the database. Ids of unknown
+    properties are left out.
+    """
+    versions = get_versions(property_ids)
+    bitmaps = {}
+    missing = []
+    for property_id in property_ids:
+        entry = local_bitmaps.get(property_id)
+        if entry is not None and entry[:2] == (versions[property_id], origin):
+            bitmaps[property_id] = entry[2]
+        else:
+            missing.append(property_id)
+    if not missing:
+        return bitmaps
+
+    rows = list(
+        Occupancy.objects.filter(property_id__in=missing).values_list(
+            "property_id", "origin", "bits"
+        )
+    )
+    if len(rows) < len(missing) or any(row[1] != origin for row in rows):
+        refresh(missing)
+        rows = Occupancy.objects.filter(property_id__in=missing).values_list(
+            "property_id", "origin", "bits"
+        )
+    for property_id, row_origin, bits in rows:
+        if row_origin != origin:
+            continue
+        bitmaps[property_id] = parse_bits(bits)
+        local_bitmaps.set(
+            property_id, (versions[property_id], origin, bitmaps[property_id])
+        )
+    return bitmaps
+
+
+def get_booked(property_ids, start_date, end_date):
+    """Return the ids of the properties booked on a night of the stay."""
+    property_ids = list(property_ids)
+    origin = get_origin()
+    mask = get_mask(origin, start_date, end_date)
+    bitmaps = get_bitmaps(property_ids, origin) if mask is not None else {}
+
+    booked = {property_id for property_id, bits in bitmaps.items() if bits & mask}
+    rest = [property_id for property_id in property_ids if property_id not in bitmaps]
+    if rest:
+        booked.update(
+            Reservation.objects.overlapping(start_date, end_date)
+            .filter(property_id__in=rest)
+            .values_list("property_id", flat=True)
+        )
+    return booked
+
+
+def is_available(property_id, start_date, end_date):
+    """Return True when no night of the stay is booked."""
+    return property_id not in get_booked([property_id], start_date, end_date)
+
+
+def get_stay_nights(queryset, property_id, start_date, end_date):
+    """Return the nights in ``[start_date, end_date)`` covered by stays."""
+    nights = set()
+    stays = (
+        queryset.overlapping(start_date, end_date)
+        .filter(property_id=property_id)
+        .values_list("start_date", "end_date")
+    )
+    for stay_start, stay_end in stays:
+        first = max(stay_start, start_date)
+        last = min(stay_end, end_date)
+        nights.update(
+            first + timedelta(days=night) for night in range((last - first).days)
+        )
+    return nights
+
+
+def get_booked_nights(property_id, start_date, end_date):
+    """
+    Return the nights of a property in ``[start_date, end_date)`` that are
+    booked or held.
+    """
+    nights = None
+    origin = get_origin()
+    if get_mask(origin, start_date, end_date) is not None:
+        bitmap = get_bitmaps([property_id], origin).get(property_id)
+        if bitmap is not None:
+            nights = set(get_nights(bitmap, origin, start_date, end_date))
+    if nights is None:
+        nights = get_stay_nights(
+            Reservation.objects.all(), property_id, start_date, end_date
+        )
+
+    nights.update(
+        get_stay_nights(Hold.objects.active(), property_id, start_date, end_date)
+    )
+    return sorted(nights)
+
+
+def get_booked_filter(start_date, end_date, field="pk"):
+    """
+    Return a Q matching properties booked or held on a night of the stay.
+
+    The AND with the night mask runs in SQL on the current window's rows;
+    properties without one, and stays outside the window, use the range
+    query over reservations. Active holds always use the range query.
+    """
+    overlapping = Exists(
+        Reservation.objects.overlapping(start_date, end_date).filter(
+            property=OuterRef(field)
+        )
+    )
+    held = Q(
+        Exists(
+            Hold.objects.active()
+            .overlapping(start_date, end_date)
+            .filter(property=OuterRef(field))
+        )
+    )
+    origin = get_origin()
+    mask = get_mask(origin, start_date, end_date)
+    if mask is None:
+        return Q(overlapping) | held
+
+    current = Occupancy.objects.filter(property=OuterRef(field), origin=origin)
+    busy = current.alias(
+        nights=Func(
+            F("bits"),
+            Cast(Value(format_bits(mask)), BitStringField()),
+            function="bit_count",
+            template="%(function)s(%(expressions)s)",
+            arg_joiner=" & ",
+            output_field=IntegerField(),
+        )
+    ).filter(nights__gt=0)
+    return Q(Exists(busy)) | (~Q(Exists(current)) & Q(overlapping)) | held
+
+
+# Changed stays of a statement as ``(property_id, start_date, end_date, booked)``.
+CHANGES = {
+    "INSERT": "SELECT property_id, start_date, end_date, 1 AS booked FROM new_rows",
+    "DELETE": "SELECT property_id, start_date, end_date, 0 AS booked FROM old_rows",
+}
+CHANGES["UPDATE"] = f"{CHANGES['DELETE']} UNION ALL {CHANGES['INSERT']}"
+
+EVENTS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_rows",
+    "UPDATE": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def get_apply_sql(changes):
+    """Return the trigger statements applying one statement's changes."""
+    # Rows rebuilt by the refresh already include the changes; only rows
+    # that were current get the nights set or cleared, old stays first.
+    return f"""
+        current_ids := ARRAY(
+            SELECT {TABLE}_refresh(ARRAY(SELECT property_id FROM ({changes}) c))
+        );
+        FOR stay IN
+            SELECT * FROM ({changes}) c
+            WHERE property_id = ANY(current_ids)
+            ORDER BY booked
+        LOOP
+            UPDATE {TABLE}
+            SET bits = {TABLE}_mark(
+                bits, origin, stay.start_date, stay.end_date, stay.booked
+            )
+            WHERE property_id = stay.property_id;
+        END LOOP;"""
+
+
+def get_create_sql():
+    """Return the statements installing the occupancy functions and triggers."""
+    statements = [
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_mark(
+    bits bit varying, window_start date, start_date date, end_date date, booked int
+) RETURNS bit varying LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN lo < hi THEN overlay(
+            bits PLACING repeat(booked::text, hi - lo)::bit varying
+            FROM lo + 1 FOR hi - lo
+        )
+        ELSE bits
+    END
+    FROM (
+        SELECT
+            GREATEST(start_date - window_start, 0) AS lo,
+            LEAST(end_date - window_start, length(bits)) AS hi
+    ) AS nights
+$$;
+""",
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_build(target bigint, window_start date)
+RETURNS bit varying LANGUAGE plpgsql AS $$
+DECLARE
+    bits bit varying := repeat('0', {WINDOW_DAYS})::bit varying;
+    stay record;
+BEGIN
+    FOR stay IN
+        SELECT start_date, end_date FROM reservation_reservation
+        WHERE property_id = target
+            AND start_date < window_start + {WINDOW_DAYS}
+            AND end_date > window_start
+    LOOP
+        bits := {TABLE}_mark(bits, window_start, stay.start_date, stay.end_date, 1);
+    END LOOP;
+    RETURN bits;
+END
+$$;
+""",
+        # Lock each row, then build or roll it over with a fresh snapshot so
+        # no concurrent change is lost. Returns the ids of rows that were
+        # already current.
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_refresh(ids bigint[])
+RETURNS SETOF bigint LANGUAGE plpgsql AS $$
+DECLARE
+    window_start date := {ORIGIN_SQL};
+    target bigint;
+    row_origin date;
+BEGIN
+    FOR target IN
+        SELECT id FROM property_property WHERE id = ANY(ids) ORDER BY id
+    LOOP
+        SELECT origin INTO row_origin FROM {TABLE}
+        WHERE property_id = target FOR UPDATE;
+        IF NOT FOUND THEN
+            INSERT INTO {TABLE} (property_id, origin, bits)
+            VALUES (target, window_start, {TABLE}_build(target, window_start))
+            ON CONFLICT (property_id) DO NOTHING;
+            CONTINUE WHEN FOUND;
+            SELECT origin INTO row_origin FROM {TABLE}
+            WHERE property_id = target FOR UPDATE;
+        END IF;
+        IF row_origin = window_start THEN
+            RETURN NEXT target;
+        ELSE
+            UPDATE {TABLE}
+            SET origin = window_start, bits = {TABLE}_build(target, window_start)
+            WHERE property_id = target;
+        END IF;
+    END LOOP;
+END
+$$;
+""",
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    current_ids bigint[];
+    stay record;
+BEGIN
+    IF TG_OP = 'INSERT' THEN{get_apply_sql(CHANGES["INSERT"])}
+    ELSIF TG_OP = 'DELETE' THEN{get_apply_sql(CHANGES["DELETE"])}
+    ELSE{get_apply_sql(CHANGES["UPDATE"])}
+    END IF;
+    RETURN NULL;
+END
+$$;
+""",
+        f"""
+CREATE OR REPLACE FUNCTION {TABLE}_property_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO {TABLE} (property_id, origin, bits)
+        SELECT id, {ORIGIN_SQL}, repeat('0', {WINDOW_DAYS})::bit varying
+        FROM new_rows
+        ON CONFLICT (property_id) DO NOTHING;
+    ELSE
+        DELETE FROM {TABLE} o USING old_rows p WHERE o.property_id = p.id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+""",
+    ]
+    for event, referencing in EVENTS.items():
+        statements.append(
+            f"CREATE TRIGGER {TABLE}_{event.lower()} "
+            f"AFTER {event} ON reservation_reservation {referencing} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {TABLE}_sync()"
+        )
+    for event in ("INSERT", "DELETE"):
+        statements.append(
+            f"CREATE TRIGGER {TABLE}_property_{event.lower()} "
+            f"AFTER {event} ON property_property {EVENTS[event]} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {TABLE}_property_sync()"
+        )
+    return statements
+
+
+def get_drop_sql():
+    """Return the statements removing the occupancy functions and triggers."""
+    statements = [
+        f"DROP TRIGGER IF EXISTS {TABLE}_{event.lower()} ON reservation_reservation"
+        for event in EVENTS
+    ]
+    statements += [
+        f"DROP TRIGGER IF EXISTS {TABLE}_property_{event} ON property_property"
+        for event in ("insert", "delete")
+    ]
+    statements += [
+        f"DROP FUNCTION IF EXISTS {TABLE}_property_sync()",
+        f"DROP FUNCTION IF EXISTS {TABLE}_sync()",
+        f"DROP FUNCTION IF EXISTS {TABLE}_refresh(bigint[])",
+        f"DROP FUNCTION IF EXISTS {TABLE}_build(bigint, date)",
+        f"DROP FUNCTION IF EXISTS {TABLE}_mark(bit varying, date, date, date, int)",
+    ]
+    return statements
+
+
+def get_backfill_sql():
+    """Return the statement building a row for every property."""
+    return f"SELECT {TABLE}_refresh(ARRAY(SELECT id FROM property_property))"
@@ -2,12 +2,15 @@
 Serializers for reservation API View.
 """
 
+from django.conf import settings
+
 from rest_framework import serializers
 
-from reservation.models import Reservation
+from config.fieldsets import SparseFieldsSerializerMixin
+from reservation.models import Hold, Reservation, ReservationTombstone
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for reservations."""
 
     class Meta:
@@ -17,10 +20,100 @@ class ReservationSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """Validate that start date is before end date."""
-        start_date = attrs.get("start_date")
-        end_date = attrs.get("end_date")
+        return validate_dates(attrs)
+
+
+class OwnerReservationSerializer(serializers.ModelSerializer):
+    """Serializer for reservations on the owner's properties."""
+
+    property_name = serializers.CharField(source="property.name", read_only=True)
+    guest_email = serializers.EmailField(source="user.email", read_only=True)
+    guest_name = serializers.CharField(source="user.name", read_only=True)
+
+    class Meta:
+        model = Reservation
+        fields = [
+            "id",
+            "property",
+            "property_name",
+            "user",
+            "guest_email",
+            "guest_name",
+            "start_date",
+            "end_date",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class ReservationTombstoneSerializer(serializers.ModelSerializer):
+    """Serializer for reservations deleted from the owner's properties."""
+
+    id = serializers.IntegerField(source="reservation_id", read_only=True)
+
+    class Meta:
+        model = ReservationTombstone
+        fields = ["id", "property", "deleted_at"]
+        read_only_fields = fields
+
+
+class ReservationBulkItemSerializer(serializers.Serializer):
+    """Serializer for one reservation of a batch, validated without queries."""
+
+    property = serializers.IntegerField(min_value=1)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, attrs):
+        """Validate that start date is before end date."""
+        return validate_dates(attrs)
 
-        if start_date > end_date:
+
+class ReservationBulkSerializer(serializers.Serializer):
+    """Serializer for a batch of reservations."""
+
+    reservations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.RESERVATION_BULK_MAX_SIZE,
+    )
+
+
+class HoldSerializer(serializers.ModelSerializer):
+    """Serializer for holds."""
+
+    class Meta:
+        model = Hold
+        fields = ["id", "property", "user", "start_date", "end_date", "expires_at"]
+        read_only_fields = ["id", "user", "expires_at"]
+
+    def validate(self, attrs):
+        """Validate that the hold covers at least one night."""
+        if attrs["start_date"] >= attrs["end_date"]:
             raise serializers.ValidationError("End date must be after start date.")
 
         return attrs
+
+
+class HoldConfirmSerializer(serializers.Serializer):
+    """Serializer for the payment turning a hold into a reservation."""
+
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    payment_method = serializers.CharField(max_length=100)
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Amount must be greater than zero.")
+
+        return value
+
+
+def validate_dates(attrs):
+    """Validate that start date is before end date."""
+    start_date = attrs.get("start_date")
+    end_date = attrs.get("end_date")
+
+    if start_date > end_date:
+        raise serializers.ValidationError("End date must be after start date.")
+
+    return attrs
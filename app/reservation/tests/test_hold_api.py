@@ -0,0 +1,225 @@
+"""
+Tests for reservation hold API.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from payment.models import Payment
+from property.models import Property
+from reservation.models import HELD_MESSAGE, NO_OVERLAP_MESSAGE, Hold, Reservation
+
+
+HOLD_URL = reverse("reservation:hold-list")
+RESERVATION_URL = reverse("reservation:reservation-list")
+BULK_URL = reverse("reservation:reservation-bulk")
+
+
+def detail_url(hold_id):
+    """Create and return hold detail url."""
+    return reverse("reservation:hold-detail", args=[hold_id])
+
+
+def confirm_url(hold_id):
+    """Create and return hold confirm url."""
+    return reverse("reservation:hold-confirm", args=[hold_id])
+
+
+def create_user(email="test@example.com", password="Test123"):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email=email, password=password)
+
+
+def stay(start, end):
+    """Return the dates of a stay starting ``start`` days from today."""
+    today = date.today()
+    return today + timedelta(days=start), today + timedelta(days=end)
+
+
+class PrivateHoldApiTests(TestCase):
+    """Test authenticated hold requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.other = create_user(email="other@example.com")
+        self.property = Property.objects.create(
+            name="Hotel", location="Warsaw", price=Decimal("1.5"), description=""
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_hold(self, user, start, end, expires_in=60):
+        start_date, end_date = stay(start, end)
+        return Hold.objects.create(
+            user=user,
+            property=self.property,
+            start_date=start_date,
+            end_date=end_date,
+            expires_at=timezone.now() + timedelta(seconds=expires_in),
+        )
+
+    def payload(self, start, end):
+        start_date, end_date = stay(start, end)
+        return {
+            "property": self.property.id,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+    def test_create_hold(self):
+        """Test a hold belongs to the user and expires after the TTL."""
+        before = timezone.now()
+
+        res = self.client.post(HOLD_URL, self.payload(1, 3))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        hold = Hold.objects.get(id=res.data["id"])
+        self.assertEqual(hold.user, self.user)
+        ttl = timedelta(seconds=settings.RESERVATION_HOLD_TTL)
+        self.assertTrue(before + ttl <= hold.expires_at <= timezone.now() + ttl)
+
+    def test_create_hold_requires_nights(self):
+        """Test a hold must cover at least one night."""
+        res = self.client.post(HOLD_URL, self.payload(3, 3))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_overlapping_hold_conflict(self):
+        """Test an active hold blocks other holds."""
+        self.create_hold(self.other, 2, 5)
+
+        res = self.client.post(HOLD_URL, self.payload(4, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"], HELD_MESSAGE)
+
+    def test_expired_hold_is_replaced(self):
+        """Test an expired hold no longer blocks its nights."""
+        expired = self.create_hold(self.other, 2, 5, expires_in=-1)
+
+        res = self.client.post(HOLD_URL, self.payload(4, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Hold.objects.filter(id=expired.id).exists())
+
+    def test_hold_on_booked_nights_conflict(self):
+        """Test a hold cannot cover reserved nights."""
+        start_date, end_date = stay(2, 5)
+        Reservation.objects.create(
+            user=self.other,
+            property=self.property,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        res = self.client.post(HOLD_URL, self.payload(4, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"], NO_OVERLAP_MESSAGE)
+
+    def test_hold_blocks_reservations(self):
+        """Test an active hold blocks reservations until it expires."""
+        hold = self.create_hold(self.other, 2, 5)
+
+        res = self.client.post(RESERVATION_URL, self.payload(4, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"], HELD_MESSAGE)
+
+        res = self.client.post(RESERVATION_URL, self.payload(5, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        hold.expires_at = timezone.now()
+        hold.save()
+        res = self.client.post(RESERVATION_URL, self.payload(3, 4))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_hold_blocks_bulk_items(self):
+        """Test bulk reservations overlapping a hold fail only their item."""
+        self.create_hold(self.other, 2, 5)
+        items = [self.payload(0, 3), self.payload(5, 7)]
+
+        res = self.client.post(BULK_URL, {"reservations": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [result["status"] for result in res.data["results"]]
+        self.assertEqual(statuses, [409, 201])
+
+    def test_list_active_holds_of_user(self):
+        """Test only the user's active holds are listed."""
+        hold = self.create_hold(self.user, 1, 2)
+        self.create_hold(self.user, 3, 4, expires_in=-1)
+        self.create_hold(self.other, 5, 6)
+
+        res = self.client.get(HOLD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data], [hold.id])
+
+    def test_release_hold(self):
+        """Test deleting a hold frees its nights."""
+        hold = self.create_hold(self.user, 1, 3)
+
+        res = self.client.delete(detail_url(hold.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Hold.objects.exists())
+
+    def test_confirm_hold(self):
+        """Test paying for a hold turns it into a reservation."""
+        hold = self.create_hold(self.user, 1, 3)
+        payload = {"amount": "120.00", "payment_method": "card"}
+
+        res = self.client.post(confirm_url(hold.id), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Hold.objects.exists())
+        reservation = Reservation.objects.get(id=res.data["reservation"]["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(
+            (reservation.start_date, reservation.end_date),
+            (hold.start_date, hold.end_date),
+        )
+        payment = Payment.objects.get(id=res.data["payment"]["id"])
+        self.assertEqual(payment.reservation, reservation)
+        self.assertEqual(payment.amount, Decimal("120.00"))
+
+    def test_confirm_expired_hold_conflict(self):
+        """Test an expired hold cannot be confirmed."""
+        hold = self.create_hold(self.user, 1, 3, expires_in=-1)
+        payload = {"amount": "120.00", "payment_method": "card"}
+
+        res = self.client.post(confirm_url(hold.id), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_confirm_other_users_hold_not_found(self):
+        """Test holds of other users cannot be confirmed."""
+        hold = self.create_hold(self.other, 1, 3)
+        payload = {"amount": "120.00", "payment_method": "card"}
+
+        res = self.client.post(confirm_url(hold.id), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Hold.objects.filter(id=hold.id).exists())
+
+    def test_confirm_invalid_payment(self):
+        """Test the hold is kept when the payment is invalid."""
+        hold = self.create_hold(self.user, 1, 3)
+
+        res = self.client.post(confirm_url(hold.id), {"amount": "0"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Hold.objects.filter(id=hold.id).exists())
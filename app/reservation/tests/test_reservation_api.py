@@ -6,12 +6,17 @@ from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.conf import settings
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.utils.http import http_date
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from datetime import date, timedelta
+import json
+import time
 
 from property.models import Property
 from reservation.models import Reservation
@@ -19,6 +24,9 @@ from reservation.serializers import ReservationSerializer
 
 
 RESERVATION_URL = reverse("reservation:reservation-list")
+BULK_URL = reverse("reservation:reservation-bulk")
+OWNER_RESERVATION_URL = reverse("reservation:owner-reservation-list")
+OWNER_DELETED_URL = reverse("reservation:owner-reservation-deleted-list")
 
 
 def detail_url(reservation_id):
@@ -104,6 +112,20 @@ class PrivateReservationApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
+    def test_retrieve_reservations_sparse_fields(self):
+        """Test ?fields= limits the reservation fields returned."""
+        Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=1),
+        )
+
+        res = self.client.get(RESERVATION_URL, {"fields": "id,start_date"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data[0]), {"id", "start_date"})
+
     def test_create_reservation_add_owner(self):
         """Test creating reservation automatically adds the logged-in user as the owner."""
         payload = {
@@ -151,3 +173,502 @@ class PrivateReservationApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         exists = Reservation.objects.filter(id=reservation.id).exists()
         self.assertFalse(exists)
+
+    def test_create_overlapping_reservation_conflict(self):
+        """Test booking dates that overlap an existing stay returns 409."""
+        other_user = create_user(email="other@example.com")
+        Reservation.objects.create(
+            user=other_user,
+            property=self.property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=3),
+        )
+        payload = {
+            "property": self.property.id,
+            "start_date": date.today() + timedelta(days=2),
+            "end_date": date.today() + timedelta(days=5),
+        }
+        res = self.client.post(RESERVATION_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["detail"],
+            "This property is already booked for the selected dates.",
+        )
+        self.assertFalse(Reservation.objects.filter(user=self.user).exists())
+
+    def test_conditional_get_reservations(self):
+        """Test reservation list supports ETag validators only."""
+        Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=1),
+        )
+        res = self.client.get(RESERVATION_URL)
+        self.assertTrue(res["ETag"].startswith('W/"'))
+        self.assertNotIn("Last-Modified", res)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(RESERVATION_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_conditional_get_changes_after_delete(self):
+        """Test deleting a reservation changes the list ETag."""
+        reservation = Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=1),
+        )
+        Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today() + timedelta(days=1),
+            end_date=date.today() + timedelta(days=2),
+        )
+        etag = self.client.get(RESERVATION_URL)["ETag"]
+
+        reservation.delete()
+        res = self.client.get(RESERVATION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_if_modified_since_after_delete(self):
+        """Test deleting a reservation is not hidden by If-Modified-Since."""
+        reservation = Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=1),
+        )
+        Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=date.today() + timedelta(days=1),
+            end_date=date.today() + timedelta(days=2),
+        )
+        since = http_date(time.time() + 60)
+
+        reservation.delete()
+        res = self.client.get(RESERVATION_URL, HTTP_IF_MODIFIED_SINCE=since)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def create_stays(self, offsets):
+        """Create one-night reservations starting at the given day offsets."""
+        today = date.today()
+        return [
+            Reservation.objects.create(
+                user=self.user,
+                property=self.property,
+                start_date=today + timedelta(days=offset),
+                end_date=today + timedelta(days=offset + 1),
+            )
+            for offset in offsets
+        ]
+
+    def test_paginate_reservations_with_cursor(self):
+        """Test walking the reservation list page by page with cursors."""
+        reservations = self.create_stays([3, -2, 0, 5, -1])
+        expected = sorted(reservations, key=lambda r: (r.start_date, r.id))
+        ids = [reservation.id for reservation in expected]
+
+        res = self.client.get(RESERVATION_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data["results"]], ids[:2])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([r["id"] for r in res.data["results"]], ids[2:4])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([r["id"] for r in res.data["results"]], ids[4:])
+        self.assertIsNone(res.data["next"])
+
+    def test_filter_reservations_by_when(self):
+        """Test upcoming stays are listed first to last, past ones latest first."""
+        past_early, upcoming_late, today, past_late = self.create_stays([-5, 4, 0, -1])
+
+        upcoming = self.client.get(RESERVATION_URL, {"when": "upcoming"})
+        past = self.client.get(RESERVATION_URL, {"when": "past", "page_size": 1})
+
+        self.assertEqual([r["id"] for r in upcoming.data], [today.id, upcoming_late.id])
+        self.assertEqual([r["id"] for r in past.data["results"]], [past_late.id])
+        res = self.client.get(past.data["next"])
+        self.assertEqual([r["id"] for r in res.data["results"]], [past_early.id])
+
+    def test_legacy_paths_redirect(self):
+        """Test slash-less legacy paths redirect and keep the method."""
+        res = self.client.get("/api/reservationreservations/", {"when": "past"})
+
+        self.assertEqual(res.status_code, 308)
+        self.assertEqual(res["Location"], f"{RESERVATION_URL}?when=past")
+
+        res = self.client.post("/api/reservationholds/")
+
+        self.assertEqual(res.status_code, 308)
+        self.assertEqual(res["Location"], reverse("reservation:hold-list"))
+
+    def test_filter_in_progress_stay_is_upcoming(self):
+        """Test a stay is upcoming until its check-out day."""
+        today = date.today()
+        in_progress = Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=today - timedelta(days=2),
+            end_date=today + timedelta(days=2),
+        )
+        checked_out = Reservation.objects.create(
+            user=self.user,
+            property=self.property,
+            start_date=today - timedelta(days=4),
+            end_date=today - timedelta(days=2),
+        )
+
+        upcoming = self.client.get(RESERVATION_URL, {"when": "upcoming"})
+        past = self.client.get(RESERVATION_URL, {"when": "past"})
+
+        self.assertEqual([r["id"] for r in upcoming.data], [in_progress.id])
+        self.assertEqual([r["id"] for r in past.data], [checked_out.id])
+
+    def test_filter_reservations_invalid_when(self):
+        """Test an unknown ``when`` value is rejected."""
+        res = self.client.get(RESERVATION_URL, {"when": "someday"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_conditional_get_reservation_page(self):
+        """Test the page ETag changes when a row of the page is deleted."""
+        first, second, third = self.create_stays([1, 2, 3])
+        params = {"page_size": 2}
+        etag = self.client.get(RESERVATION_URL, params)["ETag"]
+
+        second.delete()
+        res = self.client.get(RESERVATION_URL, params, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data["results"]], [first.id, third.id])
+
+    def test_create_reservation_idempotent_retry(self):
+        """Test retrying a create with the same Idempotency-Key replays it."""
+        payload = {
+            "property": self.property.id,
+            "start_date": date.today(),
+            "end_date": date.today() + timedelta(days=2),
+        }
+        res = self.client.post(RESERVATION_URL, payload, HTTP_IDEMPOTENCY_KEY="abc")
+        retry = self.client.post(RESERVATION_URL, payload, HTTP_IDEMPOTENCY_KEY="abc")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, res.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Reservation.objects.filter(user=self.user).count(), 1)
+
+
+class BulkReservationApiTests(TestCase):
+    """Test creating reservations in batches."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.property = create_property(
+            name="Hotel", location="Warsaw", price=Decimal("1.5"), description=""
+        )
+        self.other = create_property(
+            name="Villa", location="Gdansk", price=Decimal("2.5"), description=""
+        )
+
+    def item(self, property, start, end):
+        today = date.today()
+        return {
+            "property": property.id,
+            "start_date": today + timedelta(days=start),
+            "end_date": today + timedelta(days=end),
+        }
+
+    def test_bulk_create_reservations(self):
+        """Test a batch is inserted with a fixed number of queries."""
+        items = [self.item(self.property, day, day + 1) for day in range(50)]
+        items.append(self.item(self.other, 0, 5))
+
+        with self.assertNumQueries(5):
+            res = self.client.post(BULK_URL, {"reservations": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.filter(user=self.user).count(), 51)
+        first = res.data["results"][0]
+        self.assertEqual(first["status"], 201)
+        reservation = Reservation.objects.get(id=first["data"]["id"])
+        self.assertEqual(first["data"], ReservationSerializer(reservation).data)
+
+    def test_bulk_reports_conflicts_per_item(self):
+        """Test overlaps within the batch and with booked stays are rejected."""
+        Reservation.objects.create(
+            user=create_user(email="other@example.com"),
+            property=self.property,
+            start_date=date.today() + timedelta(days=10),
+            end_date=date.today() + timedelta(days=12),
+        )
+        items = [
+            self.item(self.property, 2, 6),
+            self.item(self.property, 0, 3),
+            self.item(self.property, 11, 14),
+            self.item(self.other, 2, 6),
+            self.item(self.property, 6, 10),
+        ]
+
+        res = self.client.post(BULK_URL, {"reservations": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [result["status"] for result in res.data["results"]]
+        self.assertEqual(statuses, [409, 201, 409, 201, 201])
+        self.assertEqual(Reservation.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_reports_invalid_items(self):
+        """Test invalid dates and unknown properties fail only their item."""
+        items = [
+            self.item(self.property, 3, 1),
+            {"property": 99999, "start_date": "2030-01-01", "end_date": "2030-01-02"},
+            {"property": self.property.id},
+            self.item(self.property, 1, 3),
+        ]
+
+        res = self.client.post(BULK_URL, {"reservations": items}, format="json")
+
+        results = res.data["results"]
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r["status"] for r in results], [400, 400, 400, 201])
+        self.assertIn("property", results[1]["errors"])
+        self.assertIn("start_date", results[2]["errors"])
+
+    def test_bulk_rejects_empty_or_oversized_batch(self):
+        """Test batch size is limited."""
+        items = [self.item(self.property, 0, 1)] * (
+            settings.RESERVATION_BULK_MAX_SIZE + 1
+        )
+
+        for batch in ([], items):
+            res = self.client.post(BULK_URL, {"reservations": batch}, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+
+class ExportReservationApiTests(TestCase):
+    """Test exporting reservations."""
+
+    def test_export_limited_to_user(self):
+        """Test the export only streams the user's reservations."""
+        user = create_user()
+        other_user = create_user(email="other@example.com")
+        property = create_property(
+            name="Hotel", location="Warsaw", price=Decimal("1.5"), description=""
+        )
+        reservation = Reservation.objects.create(
+            user=user,
+            property=property,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=1),
+        )
+        Reservation.objects.create(
+            user=other_user,
+            property=property,
+            start_date=date.today() + timedelta(days=1),
+            end_date=date.today() + timedelta(days=2),
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        res = client.get(reverse("reservation:reservation-export"))
+
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [
+                {
+                    "id": reservation.id,
+                    "property": property.id,
+                    "user": user.id,
+                    "start_date": reservation.start_date.isoformat(),
+                    "end_date": reservation.end_date.isoformat(),
+                }
+            ],
+        )
+
+
+class OwnerReservationApiTests(TestCase):
+    """Test the reservation feed of property owners."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user(email="owner@example.com")
+        self.guest = create_user(email="guest@example.com")
+        self.client.force_authenticate(self.owner)
+        self.property = Property.objects.create(
+            name="Hotel", price=Decimal("1.5"), owner=self.owner
+        )
+        self.other = Property.objects.create(
+            name="Villa", price=Decimal("2.5"), owner=self.guest
+        )
+
+    def book(self, property, start, end):
+        today = date.today()
+        return Reservation.objects.create(
+            user=self.guest,
+            property=property,
+            start_date=today + timedelta(days=start),
+            end_date=today + timedelta(days=end),
+        )
+
+    def test_list_reservations_on_owned_properties(self):
+        """Test only bookings on the user's properties are listed, without N+1."""
+        later = self.book(self.property, 5, 6)
+        first = self.book(self.property, 1, 3)
+        self.book(self.other, 1, 3)
+
+        # Sync token, conditional aggregate and the joined rows.
+        with self.assertNumQueries(3):
+            res = self.client.get(OWNER_RESERVATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data], [first.id, later.id])
+        self.assertEqual(res.data[0]["property_name"], "Hotel")
+        self.assertEqual(res.data[0]["guest_email"], "guest@example.com")
+
+    def test_paginate_owner_reservations(self):
+        """Test walking the feed page by page with cursors."""
+        reservations = [self.book(self.property, day, day + 1) for day in range(5)]
+
+        res = self.client.get(OWNER_RESERVATION_URL, {"page_size": 3})
+        ids = [r["id"] for r in res.data["results"]]
+        res = self.client.get(res.data["next"])
+        ids += [r["id"] for r in res.data["results"]]
+
+        self.assertEqual(ids, [reservation.id for reservation in reservations])
+        self.assertIsNone(res.data["next"])
+
+    def test_owner_feed_has_no_detail_route(self):
+        """Test the feed only lists; there is no per-reservation route."""
+        reservation = self.book(self.property, 1, 2)
+
+        res = self.client.get(f"{OWNER_RESERVATION_URL}{reservation.id}/")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_deleted_reservations(self):
+        """Test deletions on the user's properties are listed with a token."""
+        deleted = self.book(self.property, 1, 2)
+        self.book(self.property, 3, 4)
+        elsewhere = self.book(self.other, 1, 2)
+
+        deleted_id = deleted.id
+        deleted.delete()
+        elsewhere.delete()
+        res = self.client.get(OWNER_DELETED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["X-Sync-Token"].isdigit())
+        self.assertEqual(
+            [(r["id"], r["property"]) for r in res.data],
+            [(deleted_id, self.property.id)],
+        )
+
+    def test_updated_since_invalid(self):
+        """Test a malformed sync token is rejected."""
+        res = self.client.get(OWNER_RESERVATION_URL, {"updated_since": "yesterday"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OwnerReservationSyncTests(TransactionTestCase):
+    """Test incremental owner syncs across committed transactions."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user(email="owner@example.com")
+        self.guest = create_user(email="guest@example.com")
+        self.client.force_authenticate(self.owner)
+        self.property = Property.objects.create(
+            name="Hotel", price=Decimal("1.5"), owner=self.owner
+        )
+        self.villa = Property.objects.create(
+            name="Villa", price=Decimal("2.5"), owner=self.owner
+        )
+        self.other = Property.objects.create(
+            name="Cabin", price=Decimal("3.5"), owner=self.guest
+        )
+
+    def book(self, property, start, end):
+        today = date.today()
+        return Reservation.objects.create(
+            user=self.guest,
+            property=property,
+            start_date=today + timedelta(days=start),
+            end_date=today + timedelta(days=end),
+        )
+
+    def test_updated_since_lists_changes_in_order(self):
+        """Test a sync lists rows changed after the token, oldest change first."""
+        first = self.book(self.property, 1, 2)
+        second = self.book(self.property, 3, 4)
+        token = self.client.get(OWNER_RESERVATION_URL)["X-Sync-Token"]
+
+        self.book(self.other, 1, 2)
+        second.end_date += timedelta(days=1)
+        second.save()
+        first.save()
+        res = self.client.get(OWNER_RESERVATION_URL, {"updated_since": token})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data], [second.id, first.id])
+
+    def test_updated_since_lists_deletions(self):
+        """Test a sync of deletions lists only rows deleted after the token."""
+        before = self.book(self.property, 1, 2)
+        after = self.book(self.property, 3, 4)
+        before.delete()
+        token = self.client.get(OWNER_DELETED_URL)["X-Sync-Token"]
+
+        after_id = after.id
+        after.delete()
+        res = self.client.get(OWNER_DELETED_URL, {"updated_since": token})
+
+        self.assertEqual([r["id"] for r in res.data], [after_id])
+
+    def test_updated_since_includes_late_commits(self):
+        """Test a row written before the token but committed after is synced."""
+        self.book(self.property, 1, 2)
+        other = connections.create_connection("default")
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("BEGIN")
+                cursor.execute(
+                    "INSERT INTO reservation_reservation "
+                    "(property_id, user_id, start_date, end_date, updated_at, "
+                    "change_id) VALUES (%s, %s, %s, %s, now(), 0) RETURNING id",
+                    [
+                        self.villa.id,
+                        self.guest.id,
+                        date.today(),
+                        date.today() + timedelta(days=1),
+                    ],
+                )
+                late_id = cursor.fetchone()[0]
+
+                res = self.client.get(OWNER_RESERVATION_URL)
+                token = res["X-Sync-Token"]
+                self.assertNotIn(late_id, [r["id"] for r in res.data])
+
+                cursor.execute("COMMIT")
+        finally:
+            other.close()
+        res = self.client.get(OWNER_RESERVATION_URL, {"updated_since": token})
+
+        self.assertEqual([r["id"] for r in res.data], [late_id])
@@ -4,12 +4,15 @@ Test for reservation model.
 
 from decimal import Decimal
 
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
-from datetime import date
+from datetime import date, timedelta
 
-from reservation.models import Reservation
+from reservation import occupancy
+from reservation.models import Occupancy, Reservation
 from property.models import Property
 
 
@@ -36,3 +39,320 @@ class ReservationModelTest(TestCase):
         )
 
         self.assertEqual(str(reservation), f"Reservation by {user} for {property}")
+
+    def test_overlapping_reservations(self):
+        """Test overlapping treats stays as half-open date ranges."""
+        user = get_user_model().objects.create(email="Test@example.com")
+        property = Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        reservation = Reservation.objects.create(
+            property=property,
+            user=user,
+            start_date=date(2024, 7, 10),
+            end_date=date(2024, 7, 15),
+        )
+
+        overlapping = Reservation.objects.overlapping(
+            date(2024, 7, 14), date(2024, 7, 20)
+        )
+        adjacent = Reservation.objects.overlapping(date(2024, 7, 15), date(2024, 7, 20))
+
+        self.assertEqual(list(overlapping), [reservation])
+        self.assertFalse(adjacent.exists())
+
+    def test_overlapping_plan_uses_constraint_index(self):
+        """Test the availability probe uses the no-overlap GiST index."""
+        user = get_user_model().objects.create(email="Test@example.com")
+        properties = Property.objects.bulk_create(
+            Property(name=f"Hotel {i}", price=Decimal("3.5")) for i in range(200)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                property=properties[i % len(properties)],
+                user=user,
+                start_date=date(2024, 1, 1) + timedelta(days=3 * (i // 200)),
+                end_date=date(2024, 1, 3) + timedelta(days=3 * (i // 200)),
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE reservation_reservation")
+
+        queryset = Reservation.objects.overlapping(
+            date(2024, 3, 1), date(2024, 3, 5)
+        ).filter(property=properties[0])
+
+        self.assertIn("reservation_no_overlap", queryset.explain())
+
+    def test_user_listing_plan_uses_user_start_index(self):
+        """Test a page of a user's reservations reads the composite index."""
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user{i}@example.com") for i in range(50)
+        )
+        properties = Property.objects.bulk_create(
+            Property(name=f"Hotel {i}", price=Decimal("3.5")) for i in range(100)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                property=properties[i % len(properties)],
+                user=users[i % len(users)],
+                start_date=date(2024, 1, 1) + timedelta(days=2 * (i // 100)),
+                end_date=date(2024, 1, 2) + timedelta(days=2 * (i // 100)),
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE reservation_reservation")
+
+        queryset = Reservation.objects.filter(
+            user=users[0], start_date__gte=date(2024, 3, 1)
+        ).order_by("start_date", "id")
+
+        self.assertIn("reservation_user_start_idx", queryset[:20].explain())
+
+    def test_upcoming_listing_plan_uses_user_end_index(self):
+        """Test the stays a user has not checked out of come from an index."""
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user{i}@example.com") for i in range(50)
+        )
+        properties = Property.objects.bulk_create(
+            Property(name=f"Hotel {i}", price=Decimal("3.5")) for i in range(100)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                property=properties[i % len(properties)],
+                user=users[i % len(users)],
+                start_date=date(2024, 1, 1) + timedelta(days=2 * (i // 100)),
+                end_date=date(2024, 1, 2) + timedelta(days=2 * (i // 100)),
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE reservation_reservation")
+
+        queryset = Reservation.objects.filter(
+            user=users[0], end_date__gt=date(2024, 3, 1)
+        ).order_by("start_date", "id")
+
+        self.assertIn("reservation_user_end_idx", queryset[:20].explain())
+
+    def test_sync_plan_uses_change_index(self):
+        """Test an incremental sync reads the (change_id, id) index."""
+        user = get_user_model().objects.create(email="Test@example.com")
+        properties = Property.objects.bulk_create(
+            Property(name=f"Hotel {i}", price=Decimal("3.5")) for i in range(100)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                property=properties[i % len(properties)],
+                user=user,
+                start_date=date(2024, 1, 1) + timedelta(days=2 * (i // 100)),
+                end_date=date(2024, 1, 2) + timedelta(days=2 * (i // 100)),
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE reservation_reservation")
+        token = Reservation.objects.aggregate(token=Max("change_id"))["token"] + 1
+
+        queryset = Reservation.objects.filter(change_id__gte=token).order_by(
+            "change_id", "id"
+        )
+
+        self.assertIn("reservation_change_idx", queryset[:20].explain())
+
+    def test_property_listing_plan_uses_property_start_index(self):
+        """Test a page of a property's reservations reads the composite index."""
+        user = get_user_model().objects.create(email="Test@example.com")
+        properties = Property.objects.bulk_create(
+            Property(name=f"Hotel {i}", price=Decimal("3.5")) for i in range(100)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                property=properties[i % len(properties)],
+                user=user,
+                start_date=date(2024, 1, 1) + timedelta(days=2 * (i // 100)),
+                end_date=date(2024, 1, 2) + timedelta(days=2 * (i // 100)),
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE reservation_reservation")
+
+        queryset = Reservation.objects.filter(
+            property=properties[0], start_date__gte=date(2024, 3, 1)
+        ).order_by("start_date", "id")
+
+        self.assertIn("reservation_property_start_idx", queryset[:20].explain())
+
+    def test_overlapping_reservation_rejected(self):
+        """Test the database rejects overlapping stays for one property."""
+        user = get_user_model().objects.create(email="Test@example.com")
+        property = Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        Reservation.objects.create(
+            property=property,
+            user=user,
+            start_date=date(2024, 7, 10),
+            end_date=date(2024, 7, 15),
+        )
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Reservation.objects.create(
+                    property=property,
+                    user=user,
+                    start_date=date(2024, 7, 12),
+                    end_date=date(2024, 7, 20),
+                )
+        Reservation.objects.create(
+            property=property,
+            user=user,
+            start_date=date(2024, 7, 15),
+            end_date=date(2024, 7, 20),
+        )
+
+        self.assertEqual(Reservation.objects.count(), 2)
+
+
+class OccupancyTests(TestCase):
+    """Test the occupancy bitmaps follow reservation writes."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com", password="Test123"
+        )
+        self.property = Property.objects.create(name="Hotel", price=Decimal("3.5"))
+        self.origin = occupancy.get_origin()
+
+    def night(self, days):
+        """Return the date of a night of the current window."""
+        return self.origin + timedelta(days=days)
+
+    def book(self, first, last, property=None):
+        """Book the nights ``[first, last)`` of the current window."""
+        return Reservation.objects.create(
+            property=property or self.property,
+            user=self.user,
+            start_date=self.night(first),
+            end_date=self.night(last),
+        )
+
+    def get_bitmap(self, property=None):
+        """Return the bitmap of a property, checking it covers the window."""
+        row = Occupancy.objects.get(property=property or self.property)
+        self.assertEqual(row.origin, self.origin)
+        return occupancy.parse_bits(row.bits)
+
+    def test_new_property_has_empty_bitmap(self):
+        """Test creating a property creates an empty bitmap for the window."""
+        row = Occupancy.objects.get(property=self.property)
+
+        self.assertEqual(row.origin, self.origin)
+        self.assertEqual(row.bits, "0" * occupancy.WINDOW_DAYS)
+
+    def test_reservation_sets_and_clears_nights(self):
+        """Test booking sets the stay's nights and deleting clears them."""
+        reservation = self.book(3, 6)
+        self.book(6, 6)
+
+        self.assertEqual(self.get_bitmap(), 0b111 << 3)
+
+        reservation.delete()
+
+        self.assertEqual(self.get_bitmap(), 0)
+
+    def test_update_moves_nights(self):
+        """Test changing a stay clears the old nights and sets the new ones."""
+        reservation = self.book(3, 6)
+        other = Property.objects.create(name="Other", price=Decimal("3.5"))
+
+        Reservation.objects.filter(pk=reservation.pk).update(
+            property=other, start_date=self.night(1), end_date=self.night(3)
+        )
+
+        self.assertEqual(self.get_bitmap(), 0)
+        self.assertEqual(self.get_bitmap(other), 0b11 << 1)
+
+    def test_bulk_create_and_window_edges(self):
+        """Test bulk inserts are applied and nights outside the window ignored."""
+        last = occupancy.WINDOW_DAYS
+        Reservation.objects.bulk_create(
+            [
+                Reservation(
+                    property=self.property,
+                    user=self.user,
+                    start_date=self.night(first),
+                    end_date=self.night(end),
+                )
+                for first, end in ((-5, 2), (4, 5), (last - 1, last + 30))
+            ]
+        )
+
+        self.assertEqual(self.get_bitmap(), 0b11 | 1 << 4 | 1 << (last - 1))
+
+    def test_stale_row_rebuilt_on_write(self):
+        """Test a row of a past window is rebuilt for the current one."""
+        self.book(0, 2)
+        Occupancy.objects.filter(property=self.property).update(
+            origin=self.origin - timedelta(days=31)
+        )
+
+        self.book(5, 6)
+
+        self.assertEqual(self.get_bitmap(), 0b11 | 1 << 5)
+
+    def test_property_delete_removes_bitmap(self):
+        """Test deleting a property deletes its bitmap."""
+        self.book(0, 2)
+
+        self.property.delete()
+
+        self.assertFalse(Occupancy.objects.exists())
+
+    def test_get_booked(self):
+        """Test availability is answered from the mirrored bitmaps."""
+        free = Property.objects.create(name="Free", price=Decimal("3.5"))
+        self.book(3, 6)
+        ids = [self.property.pk, free.pk]
+
+        booked = occupancy.get_booked(ids, self.night(5), self.night(8))
+        with self.assertNumQueries(0):
+            cached = occupancy.get_booked(ids, self.night(5), self.night(8))
+
+        self.assertEqual(booked, {self.property.pk})
+        self.assertEqual(cached, {self.property.pk})
+        self.assertEqual(occupancy.get_booked(ids, self.night(6), self.night(8)), set())
+        self.assertFalse(
+            occupancy.is_available(self.property.pk, self.night(0), self.night(4))
+        )
+
+    def test_get_booked_sees_new_reservations(self):
+        """Test a reservation write invalidates the mirrored bitmap."""
+        occupancy.get_booked([self.property.pk], self.night(0), self.night(2))
+
+        self.book(1, 2)
+
+        self.assertFalse(
+            occupancy.is_available(self.property.pk, self.night(0), self.night(2))
+        )
+
+    def test_get_booked_outside_window(self):
+        """Test stays outside the window fall back to the reservation rows."""
+        self.book(-10, -8)
+
+        booked = occupancy.get_booked(
+            [self.property.pk], self.night(-9), self.night(-5)
+        )
+
+        self.assertEqual(booked, {self.property.pk})
+
+    def test_missing_row_built_on_read(self):
+        """Test a missing bitmap is built from the reservations when read."""
+        self.book(2, 4)
+        Occupancy.objects.all().delete()
+
+        nights = occupancy.get_booked_nights(
+            self.property.pk, self.night(0), self.night(5)
+        )
+
+        self.assertEqual(nights, [self.night(2), self.night(3)])
+        self.assertEqual(self.get_bitmap(), 0b11 << 2)
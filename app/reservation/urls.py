@@ -12,6 +12,17 @@ from reservation import views
 
 router = DefaultRouter()
 router.register("reservations", views.ReservationViewSet)
+router.register("holds", views.HoldViewSet)
+router.register(
+    "owner-reservations/deleted",
+    views.OwnerReservationTombstoneViewSet,
+    basename="owner-reservation-deleted",
+)
+router.register(
+    "owner-reservations",
+    views.OwnerReservationViewSet,
+    basename="owner-reservation",
+)
 router.register(
     r"reservations/(?P<reservation_id>\d+)/payments",
     PaymentViewSet,
@@ -2,15 +2,52 @@
 Views for reservation API.
 """
 
-from rest_framework import viewsets, mixins
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from rest_framework import status, viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from django_filters.rest_framework import DjangoFilterBackend
+
+from config.conditional import ConditionalGetMixin, ConditionalListMixin
+from config.encoders import FastListMixin
+from config.export import ExportMixin
+from config.fieldsets import SparseFieldsMixin
+from config.exceptions import Conflict
+from config.pagination import KeysetPagination
+from idempotency.mixins import IdempotentCreateMixin
+from payment.models import Payment
+from payment.serializers import PaymentSerializer
+from property.models import Property
 from reservation import models, serializers
+from reservation.bulk import create_reservations
+from reservation.filters import (
+    OwnerReservationFilter,
+    ReservationFilter,
+    ReservationTombstoneFilter,
+)
+from reservation.holds import raise_conflict
+from reservation.sync import SyncTokenMixin
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
 
 
 class ReservationViewSet(
+    ConditionalGetMixin,
+    IdempotentCreateMixin,
+    SparseFieldsMixin,
+    ExportMixin,
+    FastListMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -21,15 +58,219 @@ class ReservationViewSet(
 
     serializer_class = serializers.ReservationSerializer
     queryset = models.Reservation.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReservationFilter
+    pagination_class = KeysetPagination
+    export_fields = ("id", "property", "user", "start_date", "end_date")
 
     def get_queryset(self):
         """Filter queryset to authenticated user."""
         return (
-            super().get_queryset().filter(user=self.request.user).order_by("start_date")
+            super()
+            .get_queryset()
+            .filter(user=self.request.user)
+            .order_by("start_date", "id")
         )
 
+    def get_serializer_class(self):
+        """Return the serializer class for request."""
+        if self.action == "bulk":
+            return serializers.ReservationBulkSerializer
+        return self.serializer_class
+
     def perform_create(self, serializer):
         """Create a new reservation with the authenticated user as owner."""
-        serializer.save(user=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError as error:
+            raise_conflict(error)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create a batch of reservations and report the result of each one."""
+        batch = self.get_serializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        items = batch.validated_data["reservations"]
+
+        results = [None] * len(items)
+        valid = {}
+        for index, item in enumerate(items):
+            serializer = serializers.ReservationBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                results[index] = {"status": 400, "errors": serializer.errors}
+
+        known = set(
+            Property.objects.filter(
+                pk__in={item["property"] for item in valid.values()}
+            ).values_list("pk", flat=True)
+        )
+        reservations = []
+        for index, item in list(valid.items()):
+            if item["property"] not in known:
+                message = f'Invalid pk "{item["property"]}" - object does not exist.'
+                results[index] = {"status": 400, "errors": {"property": [message]}}
+                del valid[index]
+                continue
+            reservations.append(
+                models.Reservation(
+                    user=request.user,
+                    property_id=item["property"],
+                    start_date=item["start_date"],
+                    end_date=item["end_date"],
+                )
+            )
+
+        conflicts = create_reservations(reservations)
+        for position, (index, reservation) in enumerate(zip(valid, reservations)):
+            if position in conflicts:
+                errors = {"non_field_errors": [models.NO_OVERLAP_MESSAGE]}
+                results[index] = {"status": 409, "errors": errors}
+            else:
+                data = serializers.ReservationSerializer(reservation).data
+                results[index] = {"status": 201, "data": data}
+
+        created = all(result["status"] == 201 for result in results)
+        return Response(
+            {"results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_207_MULTI_STATUS,
+        )
+
+
+class OwnerReservationViewSet(
+    SyncTokenMixin, ConditionalListMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """List reservations on the authenticated user's properties."""
+
+    serializer_class = serializers.OwnerReservationSerializer
+    queryset = models.Reservation.objects.all()
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OwnerReservationFilter
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Filter queryset to reservations on properties the user owns."""
+        return (
+            super()
+            .get_queryset()
+            .filter(property__owner=self.request.user)
+            .select_related("user", "property")
+            .order_by("start_date", "id")
+        )
+
+
+class OwnerReservationTombstoneViewSet(
+    SyncTokenMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """List reservations deleted from the authenticated user's properties."""
+
+    serializer_class = serializers.ReservationTombstoneSerializer
+    queryset = models.ReservationTombstone.objects.all()
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReservationTombstoneFilter
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Filter queryset to tombstones of properties the user owns."""
+        return (
+            super()
+            .get_queryset()
+            .filter(property__owner=self.request.user)
+            .order_by("change_id", "reservation_id")
+        )
+
+
+class HoldViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Manage the authenticated user's active holds."""
+
+    serializer_class = serializers.HoldSerializer
+    queryset = models.Hold.objects.all()
+    lookup_value_regex = r"\d+"
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Filter queryset to the authenticated user's active holds."""
+        return (
+            super()
+            .get_queryset()
+            .active()
+            .filter(user=self.request.user)
+            .order_by("expires_at")
+        )
+
+    def get_serializer_class(self):
+        """Return the serializer class for request."""
+        if self.action == "confirm":
+            return serializers.HoldConfirmSerializer
+        return self.serializer_class
+
+    def perform_create(self, serializer):
+        """Hold the nights for ``RESERVATION_HOLD_TTL`` seconds."""
+        data = serializer.validated_data
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                # Expired holds no longer block but still occupy the
+                # exclusion constraint until they are swept.
+                models.Hold.objects.expired().filter(
+                    property=data["property"]
+                ).overlapping(data["start_date"], data["end_date"]).delete()
+                serializer.save(
+                    user=self.request.user,
+                    expires_at=now + timedelta(seconds=settings.RESERVATION_HOLD_TTL),
+                )
+        except IntegrityError as error:
+            raise_conflict(error)
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        """Pay for a hold and turn it into a reservation."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            with transaction.atomic():
+                hold = (
+                    models.Hold.objects.select_for_update()
+                    .filter(pk=pk, user=request.user)
+                    .first()
+                )
+                if hold is None:
+                    raise NotFound()
+                if hold.expires_at <= timezone.now():
+                    raise Conflict("This hold has expired.")
+                hold.delete()
+                reservation = models.Reservation.objects.create(
+                    property_id=hold.property_id,
+                    user=request.user,
+                    start_date=hold.start_date,
+                    end_date=hold.end_date,
+                )
+                payment = Payment.objects.create(
+                    reservation=reservation, **serializer.validated_data
+                )
+        except IntegrityError as error:
+            raise_conflict(error)
+
+        return Response(
+            {
+                "reservation": serializers.ReservationSerializer(reservation).data,
+                "payment": PaymentSerializer(payment).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("review", "0002_review_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        # The closest known creation time of existing reviews.
+        migrations.RunSQL(
+            "UPDATE review_review SET created_at = updated_at",
+            migrations.RunSQL.noop,
+        ),
+    ]
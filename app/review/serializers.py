@@ -4,10 +4,11 @@ Serializers for review API.
 
 from rest_framework import serializers
 
+from config.fieldsets import SparseFieldsSerializerMixin
 from review.models import Review
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for review."""
 
     class Meta:
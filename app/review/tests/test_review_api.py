@@ -3,6 +3,7 @@ Tests for review API.
 """
 
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -14,6 +15,7 @@ from rest_framework.test import APIClient
 from property.models import Property
 from review.models import Review
 from review.serializers import ReviewSerializer
+from review.views import ReviewViewSet
 
 
 def property_reviews_url(property_id):
@@ -189,3 +191,74 @@ class PrivateReviewApiTests(TestCase):
         res = self.client.post(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_review_writes_update_property_rating(self):
+        """Test creating, updating and deleting reviews maintains aggregates."""
+        url = property_reviews_url(self.property.id)
+        res = self.client.post(url, {"rating": 5, "comment": "Great."})
+        self.client.post(url, {"rating": 2, "comment": "Meh."})
+
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.rating_count, 2)
+        self.assertEqual(self.property.rating_avg, Decimal("3.50"))
+        self.assertEqual(self.property.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+
+        review = Review.objects.get(comment="Great.")
+        self.client.patch(review_detail_url(self.property.id, review.id), {"rating": 4})
+
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.rating_avg, Decimal("3.00"))
+        self.assertEqual(self.property.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 1, 5: 0})
+
+        self.client.delete(review_detail_url(self.property.id, review.id))
+        review = Review.objects.get(comment="Meh.")
+        self.client.delete(review_detail_url(self.property.id, review.id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.rating_count, 0)
+        self.assertEqual(self.property.rating_avg, Decimal("0"))
+        self.assertEqual(self.property.rating_sum, 0)
+
+    def test_review_writes_use_stored_rating(self):
+        """Test rating deltas come from the stored row, not a stale instance."""
+        url = property_reviews_url(self.property.id)
+        self.client.post(url, {"rating": 5, "comment": "Great."})
+        stale = Review.objects.get()
+        # A concurrent update changes the rating after the instance was read.
+        self.client.patch(review_detail_url(self.property.id, stale.id), {"rating": 3})
+
+        with patch.object(ReviewViewSet, "get_object", return_value=stale):
+            self.client.patch(
+                review_detail_url(self.property.id, stale.id), {"rating": 4}
+            )
+
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.rating_sum, 4)
+        self.assertEqual(self.property.rating_histogram, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+
+        stale = Review.objects.get()
+        stale.rating = 1
+        with patch.object(ReviewViewSet, "get_object", return_value=stale):
+            self.client.delete(review_detail_url(self.property.id, stale.id))
+            self.client.delete(review_detail_url(self.property.id, stale.id))
+
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.rating_count, 0)
+        self.assertEqual(self.property.rating_sum, 0)
+        self.assertEqual(self.property.rating_histogram, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+
+    def test_conditional_get_review_detail(self):
+        """Test review detail returns 304 for a matching ETag."""
+        review = Review.objects.create(
+            property=self.property, user=self.user, rating=3, comment="Silla!"
+        )
+        url = review_detail_url(self.property.id, review.id)
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {"comment": "Changed."})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -2,22 +2,32 @@
 Views for review API.
 """
 
+from django.db import transaction
+
 from rest_framework import viewsets
+from rest_framework.exceptions import NotFound
 
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from config.conditional import ConditionalGetMixin
+from config.fieldsets import SparseFieldsMixin
+from config.pagination import KeysetPagination
 from review import models, serializers
 from property.models import Property
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """Manage review in the database."""
 
     serializer_class = serializers.ReviewSerializer
     queryset = models.Review.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Retrieve reviews for specific property."""
@@ -28,4 +38,41 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """Create a new review."""
         property_id = self.kwargs["property_id"]
         property = Property.objects.get(id=property_id)
-        serializer.save(user=self.request.user, property=property)
+        with transaction.atomic():
+            review = serializer.save(user=self.request.user, property=property)
+            Property.objects.filter(pk=property.pk).apply_rating(added=review.rating)
+
+    def perform_update(self, serializer):
+        """Update a review and its property rating aggregates."""
+        with transaction.atomic():
+            # Lock the row and take the stored rating, so concurrent
+            # updates apply their deltas one after the other.
+            previous = self._lock_rating(serializer.instance)
+            if previous is None:
+                raise NotFound()
+            review = serializer.save()
+            if review.rating != previous:
+                Property.objects.filter(pk=review.property_id).apply_rating(
+                    added=review.rating, removed=previous
+                )
+
+    def perform_destroy(self, instance):
+        """Delete a review and its contribution to the rating aggregates."""
+        with transaction.atomic():
+            rating = self._lock_rating(instance)
+            if rating is None:
+                # A concurrent request already deleted it.
+                return
+            instance.delete()
+            Property.objects.filter(pk=instance.property_id).apply_rating(
+                removed=rating
+            )
+
+    def _lock_rating(self, instance):
+        """Lock a review row and return its stored rating, or None if gone."""
+        return (
+            models.Review.objects.select_for_update()
+            .filter(pk=instance.pk)
+            .values_list("rating", flat=True)
+            .first()
+        )
@@ -0,0 +1,175 @@
+"""
+Authentication classes for the API.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+from user import tokens
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used mapping with a TTL."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_tokens = LRUCache(
+    settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_LOCAL_TIMEOUT
+)
+local_users = LRUCache(
+    settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_LOCAL_TIMEOUT
+)
+
+
+def get_token_cache_key(key):
+    """Return the shared cache key for a token, without exposing the token."""
+    return "auth:token:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def invalidate_token(key):
+    """Forget a cached token in this process and in the shared cache."""
+    cache_key = get_token_cache_key(key)
+    local_tokens.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def get_user_cache_key(user_id):
+    """Return the shared cache key for an authenticated user."""
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    """Forget a cached user in this process and in the shared cache."""
+    cache_key = get_user_cache_key(user_id)
+    local_users.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def get_cached_user(user_id):
+    """Return a user through the local LRU and shared cache, or None."""
+    cache_key = get_user_cache_key(user_id)
+    user = local_users.get(cache_key)
+    if user is None:
+        user = cache.get(cache_key)
+        if user is None:
+            user = get_user_model().objects.filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(cache_key, user, timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        local_users.set(cache_key, user)
+    return user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and its user.
+
+    Lookups go through a per-process LRU first, then the shared cache, and
+    only hit the database on a miss. Entries are dropped when the token is
+    deleted or its user changes. Other processes may keep a stale entry for
+    at most ``AUTH_TOKEN_CACHE_LOCAL_TIMEOUT`` seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        credentials = local_tokens.get(cache_key)
+        if credentials is None:
+            credentials = cache.get(cache_key)
+            if credentials is None:
+                credentials = super().authenticate_credentials(key)
+                cache.set(
+                    cache_key, credentials, timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT
+                )
+            local_tokens.set(cache_key, credentials)
+
+        user, token = credentials
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return credentials
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Stateless authentication with signed access tokens.
+
+    Clients should authenticate by passing the access token in the
+    "Authorization" HTTP header, prepended with the string "Bearer ".
+    Verification is CPU-only; the user is resolved through the same caches
+    as ``CachedTokenAuthentication``.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            token = auth[1].decode()
+            user_id, version = tokens.read_token(token, tokens.ACCESS)
+        except (UnicodeError, signing.BadSignature):
+            raise exceptions.AuthenticationFailed(_("Invalid or expired token."))
+
+        user = get_cached_user(user_id)
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        if user.token_version != version:
+            raise exceptions.AuthenticationFailed(_("Token has been revoked."))
+
+        return (user, token)
+
+    def authenticate_header(self, request):
+        return self.keyword
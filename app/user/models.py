@@ -8,9 +8,27 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.dispatch import Signal
 
+# Sent with the ids of users changed by a queryset update, which bypasses
+# ``post_save``.
+users_updated = Signal()
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(models.QuerySet):
+    """Queryset for users."""
+
+    def update(self, **kwargs):
+        if set(kwargs) == {"last_login"}:
+            return super().update(**kwargs)
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        if user_ids:
+            users_updated.send(sender=self.model, user_ids=user_ids)
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """Manage for users."""
 
     def create_user(self, email, password=None, **kwargs):
@@ -40,6 +58,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    token_version = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
 
@@ -3,10 +3,14 @@ Serializers for the user API View.
 """
 
 from django.contrib.auth import get_user_model, authenticate
+from django.core import signing
+from django.db.models import F
 from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from user import tokens
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user object."""
@@ -27,6 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
 
         if password:
             user.set_password(password)
+            user.token_version = F("token_version") + 1
             user.save()
 
         return user
@@ -57,3 +62,25 @@ class AuthTokenSerializer(serializers.Serializer):
         attrs["user"] = user
 
         return attrs
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Serializer for refreshing signed tokens."""
+
+    refresh = serializers.CharField(trim_whitespace=False)
+
+    def validate(self, attrs):
+        """Validate the refresh token and resolve its user."""
+        msg = _("Invalid or expired refresh token.")
+        try:
+            user_id, version = tokens.read_token(attrs["refresh"], tokens.REFRESH)
+        except signing.BadSignature:
+            raise serializers.ValidationError(msg, code="authorization")
+
+        user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+        if user is None or user.token_version != version:
+            raise serializers.ValidationError(msg, code="authorization")
+
+        attrs["user"] = user
+
+        return attrs
@@ -0,0 +1,66 @@
+"""
+Signal handlers invalidating cached authentication tokens.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_token, invalidate_user
+from user.models import users_updated
+
+
+def invalidate(keys):
+    """Forget tokens now and again once the transaction commits."""
+    keys = list(keys)
+
+    def forget():
+        for key in keys:
+            invalidate_token(key)
+
+    forget()
+    transaction.on_commit(forget)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Forget a token once it is deleted."""
+    invalidate([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, update_fields, **kwargs):
+    """Forget the user's tokens when the cached user may be out of date."""
+    if created or update_fields == frozenset(["last_login"]):
+        return
+
+    invalidate(Token.objects.filter(user=instance).values_list("key", flat=True))
+    invalidate_cached_user(sender, instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Forget the cached user for signed token authentication."""
+    invalidate_cached_users([instance.pk])
+
+
+@receiver(users_updated)
+def invalidate_updated_users(sender, user_ids, **kwargs):
+    """Forget the tokens and cached users changed by a queryset update."""
+    invalidate(Token.objects.filter(user__in=user_ids).values_list("key", flat=True))
+    invalidate_cached_users(user_ids)
+
+
+def invalidate_cached_users(user_ids):
+    """Forget cached users now and again once the transaction commits."""
+    user_ids = list(user_ids)
+
+    def forget():
+        for user_id in user_ids:
+            invalidate_user(user_id)
+
+    forget()
+    transaction.on_commit(forget)
@@ -2,17 +2,23 @@
 Tests for user API.
 """
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from user.authentication import local_tokens
 
 
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
+SIGNED_TOKEN_URL = reverse("user:signed-token")
+TOKEN_REFRESH_URL = reverse("user:token-refresh")
+TOKEN_REVOKE_URL = reverse("user:token-revoke")
 
 
 def create_user(**kwargs):
@@ -140,3 +146,144 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(self.user.name, payload["name"])
         self.assertTrue(self.user.check_password(payload["password"]))
+
+
+class TokenAuthenticationCacheTests(TestCase):
+    """Test the cached token authentication."""
+
+    def setUp(self):
+        self.user = create_user(email="test@example.com", password="Test123")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        local_tokens.clear()
+
+    def test_warm_token_needs_no_queries(self):
+        """Test a cached token authenticates without touching the database."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_shared_cache_used_after_local_miss(self):
+        """Test the shared cache serves tokens evicted from the local LRU."""
+        self.client.get(ME_URL)
+        local_tokens.clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_rejected(self):
+        """Test deleting a token invalidates the cached credentials."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating a user invalidates the cached credentials."""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_deactivated_by_queryset_update_rejected(self):
+        """Test a queryset update also invalidates the cached credentials."""
+        self.client.get(ME_URL)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class SignedTokenTests(TestCase):
+    """Test the stateless signed token flow."""
+
+    def setUp(self):
+        self.user = create_user(email="test@example.com", password="Test123")
+        self.client = APIClient()
+
+    def obtain_tokens(self):
+        res = self.client.post(
+            SIGNED_TOKEN_URL, {"email": "test@example.com", "password": "Test123"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_access_token_authenticates(self):
+        """Test a signed access token authenticates without queries when warm."""
+        tokens = self.obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_refresh_token_issues_new_pair(self):
+        """Test exchanging a refresh token for new tokens."""
+        tokens = self.obtain_tokens()
+
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": tokens["refresh"]})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("access", res.data)
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": tokens["access"]})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_revoke_invalidates_tokens(self):
+        """Test revoking bumps the token version and rejects old tokens."""
+        tokens = self.obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        res = self.client.post(TOKEN_REVOKE_URL)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_deactivated_by_queryset_update_rejected(self):
+        """Test a queryset update drops the cached user of signed tokens."""
+        tokens = self.obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.client.get(ME_URL)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNED_TOKEN_ACCESS_LIFETIME=-1)
+    def test_expired_access_token_rejected(self):
+        """Test an expired access token is rejected."""
+        tokens = self.obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tampered_token_rejected(self):
+        """Test a token with a modified payload is rejected."""
+        tokens = self.obtain_tokens()
+        forged = "x" + tokens["access"][1:]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {forged}")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
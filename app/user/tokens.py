@@ -0,0 +1,52 @@
+"""
+Stateless signed access and refresh tokens.
+
+Tokens are HMAC-signed with the project SECRET_KEY and carry the user id,
+the user's token version and the issue time, so they can be verified
+without a database lookup. Bumping ``User.token_version`` revokes every
+token issued before.
+"""
+
+from django.conf import settings
+from django.core import signing
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+SALTS = {ACCESS: "user.tokens.access", REFRESH: "user.tokens.refresh"}
+
+
+def get_lifetime(kind):
+    """Return the lifetime of a token kind in seconds."""
+    if kind == ACCESS:
+        return settings.SIGNED_TOKEN_ACCESS_LIFETIME
+    return settings.SIGNED_TOKEN_REFRESH_LIFETIME
+
+
+def make_token(user, kind):
+    """Return a signed token of the given kind for user."""
+    payload = {"uid": user.pk, "ver": user.token_version}
+    return signing.dumps(payload, salt=SALTS[kind])
+
+
+def issue_tokens(user):
+    """Return a fresh access/refresh token pair for user."""
+    return {
+        "access": make_token(user, ACCESS),
+        "refresh": make_token(user, REFRESH),
+        "expires_in": get_lifetime(ACCESS),
+    }
+
+
+def read_token(token, kind):
+    """
+    Verify a token and return its ``(user_id, token_version)``.
+
+    Raises ``signing.BadSignature`` (or its ``SignatureExpired`` subclass)
+    when the token is forged, of another kind or expired.
+    """
+    payload = signing.loads(token, salt=SALTS[kind], max_age=get_lifetime(kind))
+    try:
+        return int(payload["uid"]), int(payload["ver"])
+    except (KeyError, TypeError, ValueError):
+        raise signing.BadSignature("Malformed token payload.")
@@ -2,13 +2,24 @@
 Views for user API.
 """
 
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+from django.db.models import F
+
+from rest_framework import generics, permissions, status
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from user import tokens
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
+    RefreshTokenSerializer,
 )
 
 
@@ -29,9 +40,52 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
 
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrieve and return the authenticated user."""
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+
+        # The authenticated user may come from the auth cache; never write a
+        # possibly stale snapshot back to the database.
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class CreateSignedTokenView(generics.GenericAPIView):
+    """Create a signed access/refresh token pair for user."""
+
+    serializer_class = AuthTokenSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(tokens.issue_tokens(serializer.validated_data["user"]))
+
+
+class RefreshSignedTokenView(generics.GenericAPIView):
+    """Exchange a refresh token for a new signed token pair."""
+
+    serializer_class = RefreshTokenSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(tokens.issue_tokens(serializer.validated_data["user"]))
+
+
+class RevokeSignedTokensView(APIView):
+    """Revoke every signed token issued to the authenticated user."""
+
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        user = get_user_model().objects.get(pk=request.user.pk)
+        user.token_version = F("token_version") + 1
+        user.save(update_fields=["token_version"])
+
+        return Response(status=status.HTTP_204_NO_CONTENT)